@@ -0,0 +1,52 @@
+"""create cost_data table
+
+Revision ID: 838b8db9a801
+Revises:
+Create Date: 2026-10-16 17:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '838b8db9a801'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created before migrations were introduced already have the table
+    if sa.inspect(op.get_bind()).has_table('cost_data'):
+        return
+
+    op.create_table(
+        'cost_data',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('account_id', sa.String(12), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('service', sa.String(100), nullable=False),
+        sa.Column('region', sa.String(20), nullable=False),
+        sa.Column('usage_type', sa.String(200), nullable=True),
+        sa.Column('operation', sa.String(200), nullable=True),
+        sa.Column('cost', sa.Numeric(12, 4), nullable=False),
+        sa.Column('usage_amount', sa.Numeric(15, 6), nullable=True),
+        sa.Column('usage_unit', sa.String(50), nullable=True),
+        sa.Column('dimensions', postgresql.JSONB(), nullable=True),
+        sa.Column('tags', postgresql.JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_cost_data_account_id', 'cost_data', ['account_id'])
+    op.create_index('ix_cost_data_date', 'cost_data', ['date'])
+    op.create_index('ix_cost_data_service', 'cost_data', ['service'])
+    op.create_index('ix_cost_data_region', 'cost_data', ['region'])
+    op.create_index('ix_cost_data_account_date', 'cost_data', ['account_id', 'date'])
+    op.create_index('ix_cost_data_service_date', 'cost_data', ['service', 'date'])
+    op.create_index('ix_cost_data_account_service_date', 'cost_data', ['account_id', 'service', 'date'])
+    op.create_index('ix_cost_data_region_date', 'cost_data', ['region', 'date'])
+
+
+def downgrade() -> None:
+    op.drop_table('cost_data')
@@ -0,0 +1,36 @@
+"""add cost_data unique grain index
+
+Revision ID: 9008b69a5792
+Revises: 838b8db9a801
+Create Date: 2026-10-16 15:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9008b69a5792'
+down_revision = '838b8db9a801'
+branch_labels = None
+depends_on = None
+
+GRAIN = "account_id, date, service, region, coalesce(usage_type, ''), coalesce(operation, '')"
+
+
+def upgrade() -> None:
+    # Rows sharing a grain need a human decision on which cost is right, so refuse rather than delete any
+    duplicates = op.get_bind().execute(sa.text(
+        f"SELECT count(*) FROM (SELECT 1 FROM cost_data GROUP BY {GRAIN} HAVING count(*) > 1) dup"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"cost_data has {duplicates} duplicated cost grains ({GRAIN}); "
+            "resolve them before applying uq_cost_data_grain"
+        )
+
+    op.execute(f"CREATE UNIQUE INDEX uq_cost_data_grain ON cost_data ({GRAIN})")
+
+
+def downgrade() -> None:
+    op.drop_index('uq_cost_data_grain', table_name='cost_data')
@@ -11,19 +11,8 @@ router = APIRouter()
 async def get_waste_items():
     """Get all detected waste items."""
     try:
-        waste_items = []
-
-        # Find unattached volumes
-        volumes = await aws_service.find_unattached_volumes()
-        waste_items.extend(volumes)
-
-        # Find unused Elastic IPs
-        elastic_ips = await aws_service.find_unused_elastic_ips()
-        waste_items.extend(elastic_ips)
-
-        # Find stopped instances
-        stopped_instances = await aws_service.find_stopped_instances()
-        waste_items.extend(stopped_instances)
+        # Find unattached volumes, unused Elastic IPs and stopped instances
+        waste_items = await aws_service.scan_waste()
 
         # Convert to WasteItem models
         return [WasteItem(**item) for item in waste_items]
@@ -47,17 +36,8 @@ async def remediate_waste_item(waste_id: str):
 async def get_waste_summary():
     """Get summary of waste detection results."""
     try:
-        waste_items = []
-
         # Get all waste items
-        volumes = await aws_service.find_unattached_volumes()
-        waste_items.extend(volumes)
-
-        elastic_ips = await aws_service.find_unused_elastic_ips()
-        waste_items.extend(elastic_ips)
-
-        stopped_instances = await aws_service.find_stopped_instances()
-        waste_items.extend(stopped_instances)
+        waste_items = await aws_service.scan_waste()
 
         total_items = len(waste_items)
         total_monthly_savings = sum(item.get('monthly_cost', 0) for item in waste_items)
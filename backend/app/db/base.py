@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
@@ -11,6 +12,17 @@ async_engine = create_async_engine(
     echo=settings.DEBUG,
     pool_pre_ping=True,
     pool_recycle=300,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    # Match CostSyncService's upsert batch so each executemany call is one round-trip
+    insertmanyvalues_page_size=1000,
+)
+
+# Engine for health probes: its own connection outside the application pool, no transaction wrapping
+health_engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=NullPool,
+    isolation_level="AUTOCOMMIT",
 )
 
 # Sync engine for migrations and sync operations
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
@@ -60,17 +61,38 @@ async def lifespan(app: FastAPI):
     from app.services.websocket_service import websocket_manager
     cleanup_task = asyncio.create_task(websocket_cleanup_worker())
 
+    # Start dashboard cache refresher
+    from app.services.aws_service import aws_service
+    dashboard_refresh_task = asyncio.create_task(aws_service.refresh_loop())
+
+    # Start health check samplers and the background prober
+    from app.services.health_service import health_service
+    health_service.start_prober()
+
+    # Start flushing buffered metric events and rendering the /metrics snapshot
+    from app.services.metrics_service import metrics_service
+    metrics_service.set_known_routes(route.path for route in app.routes if hasattr(route, "path"))
+    metrics_service.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down AWS Cost Sentinel API")
 
-    # Cancel cleanup task
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    # Cancel background tasks
+    for task in (cleanup_task, dashboard_refresh_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    await health_service.stop()
+    await metrics_service.stop()
+
+    # Write any buffered events before exiting
+    from app.services.event_dispatcher import event_dispatcher
+    await event_dispatcher.close()
 
     # Cleanup resources
     # await cleanup_database()
@@ -100,6 +122,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None,
     docs_url=f"{settings.API_V1_STR}/docs" if settings.DEBUG else None,
     redoc_url=f"{settings.API_V1_STR}/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -149,13 +172,13 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(force: bool = False):
     """Health check endpoint for load balancers and monitoring"""
     try:
         from app.services.health_service import health_service
 
-        # Run comprehensive health checks
-        health_result = await health_service.check_all(include_details=False)
+        # Serve the background prober's snapshot unless a fresh probe is forced
+        health_result = await health_service.check_all(include_details=False, use_cache=not force)
 
         # Return 503 if any critical components are unhealthy
         status_code = 200
@@ -176,7 +199,7 @@ async def health_check():
         if status_code == 503:
             raise HTTPException(status_code=503, detail=response)
 
-        return response
+        return ORJSONResponse(response)
 
     except HTTPException:
         raise
@@ -186,11 +209,11 @@ async def health_check():
 
 
 @app.get("/health/detailed")
-async def detailed_health_check():
+async def detailed_health_check(force: bool = False):
     """Detailed health check with full component status"""
     try:
         from app.services.health_service import health_service
-        return await health_service.check_all(include_details=True)
+        return ORJSONResponse(await health_service.check_all(include_details=True, use_cache=not force))
     except Exception as e:
         logger.error("Detailed health check failed", error=str(e))
         raise HTTPException(status_code=500, detail="Health check failed")
@@ -201,17 +224,17 @@ async def component_health_check(component: str):
     """Health check for a specific component"""
     try:
         from app.services.health_service import health_service
-        return await health_service.check_component(component)
+        return ORJSONResponse(await health_service.check_component(component))
     except Exception as e:
         logger.error("Component health check failed", error=str(e), component=component)
         raise HTTPException(status_code=500, detail=f"Component health check failed: {component}")
 
 
 @app.get("/metrics")
-async def metrics():
+async def metrics(request: Request):
     """Prometheus metrics endpoint"""
     from app.services.metrics_service import metrics_service
-    return metrics_service.export_metrics()
+    return metrics_service.export_metrics(request.headers.get("accept-encoding", ""))
 
 
 if __name__ == "__main__":
@@ -122,6 +122,10 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
 
     def _get_endpoint_name(self, request: Request) -> str:
         """Extract endpoint name from request"""
+        # Prefer the route the router already matched, when there is one
+        route = request.scope.get("route")
+        if route is not None:
+            return route.path
         try:
             for route in request.app.routes:
                 match, _ = route.matches({"type": "http", "path": request.url.path, "method": request.method})
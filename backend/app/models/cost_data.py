@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, DateTime, Index
+from sqlalchemy import Column, String, Numeric, Date, DateTime, Index, literal_column
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -32,6 +32,15 @@ class CostData(Base):
         Index('ix_cost_data_service_date', 'service', 'date'),
         Index('ix_cost_data_account_service_date', 'account_id', 'service', 'date'),
         Index('ix_cost_data_region_date', 'region', 'date'),
+        # One row per cost grain; also the conflict target for the bulk upsert in CostSyncService.
+        # Postgres 14 treats NULLs as distinct in unique indexes, so the nullable parts are coalesced.
+        Index(
+            'uq_cost_data_grain',
+            'account_id', 'date', 'service', 'region',
+            func.coalesce(usage_type, literal_column("''")),
+            func.coalesce(operation, literal_column("''")),
+            unique=True
+        ),
     )
 
     def __repr__(self):
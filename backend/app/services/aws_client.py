@@ -1,14 +1,17 @@
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, AsyncIterator, List
 import structlog
 from datetime import datetime, timedelta
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import functools
+import itertools
+import threading
 
 from app.core.config import settings
 from app.models.aws_account import AWSAccount
+from app.services.cache_service import cache_service, ce_cache_key, ce_cache_ttl
 
 logger = structlog.get_logger(__name__)
 
@@ -20,6 +23,8 @@ class AWSClientManager:
         self._clients: Dict[str, Dict[str, Any]] = {}
         self._sessions: Dict[str, boto3.Session] = {}
         self._executor = ThreadPoolExecutor(max_workers=10)
+        # Monotonic counter keeps RoleSessionName unique without a wall-clock read
+        self._session_counter = itertools.count()
 
     def _get_base_session(self) -> boto3.Session:
         """Get the base AWS session using configured credentials"""
@@ -37,7 +42,7 @@ class AWSClientManager:
 
             assume_role_kwargs = {
                 'RoleArn': role_arn,
-                'RoleSessionName': f'cost-sentinel-{int(datetime.now().timestamp())}',
+                'RoleSessionName': f'cost-sentinel-{threading.get_ident()}-{next(self._session_counter)}',
                 'DurationSeconds': 3600  # 1 hour
             }
 
@@ -200,6 +205,63 @@ class AWSCostExplorer:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, _get_cost_sync)
 
+    async def iter_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'DAILY',
+        metrics: List[str] = None,
+        group_by: List[Dict[str, str]] = None,
+        account: Optional[AWSAccount] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield ResultsByTime page by page so callers can process each before the next is fetched"""
+        params = {
+            'TimePeriod': {
+                'Start': start_date,
+                'End': end_date
+            },
+            'Granularity': granularity,
+            'Metrics': metrics or ['BlendedCost']
+        }
+
+        if group_by:
+            params['GroupBy'] = group_by
+
+        # Cost Explorer bills every request, so complete result sets are cached. Pages are never cached
+        # individually: a NextPageToken from a cached page may have expired by the time it is replayed
+        cache_key = ce_cache_key('results', {'account': account.account_id if account else None, 'params': params})
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            for results in cached:
+                yield results
+            return
+
+        def _get_page_sync(page_params):
+            try:
+                client = self.client_manager.get_client('ce', account)
+                return client.get_cost_and_usage(**page_params)
+            except ClientError as e:
+                logger.error("Failed to get cost and usage",
+                           account_id=account.account_id if account else None,
+                           error=str(e))
+                raise
+
+        pages = []
+        loop = asyncio.get_event_loop()
+        while True:
+            response = await loop.run_in_executor(self.executor, _get_page_sync, params)
+            results = response.get('ResultsByTime', [])
+            pages.append(results)
+            yield results
+
+            next_token = response.get('NextPageToken')
+            if not next_token:
+                break
+            params = {**params, 'NextPageToken': next_token}
+
+        # Recent days are still being revised, so ranges touching them expire sooner
+        cache_service.set(cache_key, pages, expire=ce_cache_ttl(end_date))
+
     async def get_rightsizing_recommendation(
         self,
         service: str = 'AmazonEC2',
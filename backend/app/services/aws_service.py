@@ -1,9 +1,65 @@
 import boto3
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import json
+from botocore.config import Config
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional
+import numpy as np
+import structlog
 
 from app.core.config import settings
+from app.services.cache_service import cache_service, ce_cache_key, ce_cache_ttl
+
+# Dashboard data is refreshed in the background and always served from Redis
+DASHBOARD_REFRESH_INTERVAL = 300
+DASHBOARD_CACHE_TTL = 900
+DASHBOARD_MONTHLY_KEY = 'dashboard:monthly'
+DASHBOARD_SERVICES_KEY = 'dashboard:services'
+
+# Monthly EBS storage price per GB by volume type
+_EBS_COST_PER_GB = {
+    'gp2': 0.10,
+    'gp3': 0.08,
+    'io1': 0.125,
+    'io2': 0.125,
+    'st1': 0.045,
+    'sc1': 0.025
+}
+_EBS_DEFAULT_COST_PER_GB = 0.10
+
+# Simplified monthly on-demand cost by instance type - in production, use actual pricing API
+_EC2_INSTANCE_COST_MAP = {
+    't2.micro': 8.47,
+    't2.small': 16.79,
+    't2.medium': 33.58,
+    't3.micro': 7.66,
+    't3.small': 15.33,
+    't3.medium': 30.66,
+    'm5.large': 69.35,
+    'm5.xlarge': 138.70,
+    'c5.large': 61.32,
+    'c5.xlarge': 122.63,
+}
+_EC2_DEFAULT_INSTANCE_COST = 50.00
+
+# Development stand-ins returned when Cost Explorer is unavailable; never cached
+_MOCK_MONTHLY_COSTS = {
+    'current_month': 45234.56,
+    'last_month': 42123.45,
+    'projected': 48500.00,
+    'savings_potential': 8234.00,
+    'trend_percentage': 7.3
+}
+_MOCK_SERVICE_COSTS = [
+    {'service': 'EC2', 'cost': 20355.42, 'percentage': 45, 'trend': 5.2},
+    {'service': 'RDS', 'cost': 13570.37, 'percentage': 30, 'trend': -2.1},
+    {'service': 'S3', 'cost': 6785.18, 'percentage': 15, 'trend': 12.8},
+    {'service': 'Lambda', 'cost': 2261.73, 'percentage': 5, 'trend': 18.5},
+    {'service': 'CloudFront', 'cost': 2261.86, 'percentage': 5, 'trend': -8.3},
+]
+
+logger = structlog.get_logger(__name__)
 
 
 class AWSService:
@@ -13,36 +69,185 @@ class AWSService:
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION
         )
-        self.cost_explorer = self.session.client('ce')
-        self.ec2 = self.session.client('ec2')
-        self.rds = self.session.client('rds')
-        self.s3 = self.session.client('s3')
+        # Clients are created on first use and reused for the lifetime of the service
+        self._clients: Dict[str, Any] = {}
+        self._client_config = Config(
+            tcp_keepalive=True,
+            max_pool_connections=50,
+            retries={'mode': 'adaptive', 'max_attempts': 10},
+            connect_timeout=3,
+            read_timeout=30
+        )
+        self._executor = ThreadPoolExecutor(max_workers=10)
+        # Caps in-flight AWS API calls to stay clear of throttling
+        self._semaphore = asyncio.Semaphore(10)
+        # Cost Explorer fetches currently running, keyed by cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _client(self, name: str) -> Any:
+        """Return the memoized boto3 client for a service, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None:
+            client = self.session.client(name, config=self._client_config)
+            self._clients[name] = client
+        return client
+
+    @property
+    def cost_explorer(self) -> Any:
+        return self._client('ce')
+
+    @property
+    def ec2(self) -> Any:
+        return self._client('ec2')
+
+    @property
+    def rds(self) -> Any:
+        return self._client('rds')
+
+    @property
+    def s3(self) -> Any:
+        return self._client('s3')
+
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking boto3 call in the thread pool so the event loop stays free."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _fetch_coalesced(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Share one in-flight fetch between all concurrent callers asking for the same key."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the fetch for everyone else
+        return await asyncio.shield(future)
+
+    async def _paginate(self, client: Any, operation: str, **kwargs) -> AsyncIterator[Dict]:
+        """Yield pages from a boto3 paginator, fetching each page off the event loop."""
+        pages = iter(client.get_paginator(operation).paginate(**kwargs))
+        while True:
+            page = await self._call(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def _get_all_cost_and_usage(self, **params) -> Dict:
+        """Call Cost Explorer get_cost_and_usage, following NextPageToken until exhausted."""
+        response = await self._call(self.cost_explorer.get_cost_and_usage, **params)
+        results_by_time = response.get('ResultsByTime', [])
+
+        # Groups for one time period can be split across pages, so merge them by start date
+        periods = {result['TimePeriod']['Start']: result for result in results_by_time}
+        while response.get('NextPageToken'):
+            response = await self._call(
+                self.cost_explorer.get_cost_and_usage,
+                NextPageToken=response['NextPageToken'],
+                **params
+            )
+            for result in response.get('ResultsByTime', []):
+                existing = periods.get(result['TimePeriod']['Start'])
+                if existing is None:
+                    periods[result['TimePeriod']['Start']] = result
+                    results_by_time.append(result)
+                else:
+                    existing.setdefault('Groups', []).extend(result.get('Groups', []))
+
+        response['ResultsByTime'] = results_by_time
+        response.pop('NextPageToken', None)
+        return response
+
+    async def refresh_loop(self):
+        """Keep dashboard data warm in Redis so requests never wait on Cost Explorer."""
+        while True:
+            try:
+                await self._refresh_dashboard_cache()
+                await asyncio.sleep(DASHBOARD_REFRESH_INTERVAL)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Dashboard cache refresh failed", error=str(e))
+                await asyncio.sleep(60)
+
+    async def _refresh_dashboard_cache(self):
+        """Fetch dashboard datasets and store them in Redis, keeping the previous value on failure."""
+        monthly_costs, service_costs = await asyncio.gather(
+            self._fetch_monthly_costs(),
+            self._fetch_service_costs(),
+            return_exceptions=True
+        )
+        for key, result in ((DASHBOARD_MONTHLY_KEY, monthly_costs), (DASHBOARD_SERVICES_KEY, service_costs)):
+            if isinstance(result, Exception):
+                logger.warning("Dashboard dataset refresh failed, keeping cached value", key=key, error=str(result))
+            else:
+                cache_service.set(key, result, expire=DASHBOARD_CACHE_TTL)
+
+    async def get_monthly_costs(self) -> Dict:
+        """Get current and previous month costs, served from the dashboard cache when warm."""
+        cached = cache_service.get(DASHBOARD_MONTHLY_KEY)
+        if cached is not None:
+            return cached
+
+        try:
+            monthly_costs = await self._fetch_monthly_costs()
+        except Exception as e:
+            logger.warning("Monthly cost fetch failed, serving mock data", error=str(e))
+            return dict(_MOCK_MONTHLY_COSTS)
+        cache_service.set(DASHBOARD_MONTHLY_KEY, monthly_costs, expire=DASHBOARD_CACHE_TTL)
+        return monthly_costs
+
+    async def get_service_costs(self) -> List[Dict]:
+        """Get cost breakdown by service, served from the dashboard cache when warm."""
+        cached = cache_service.get(DASHBOARD_SERVICES_KEY)
+        if cached is not None:
+            return cached
+
+        try:
+            service_costs = await self._fetch_service_costs()
+        except Exception as e:
+            logger.warning("Service cost fetch failed, serving mock data", error=str(e))
+            return [dict(service) for service in _MOCK_SERVICE_COSTS]
+        cache_service.set(DASHBOARD_SERVICES_KEY, service_costs, expire=DASHBOARD_CACHE_TTL)
+        return service_costs
 
     async def get_cost_and_usage(self, start_date: str, end_date: str) -> Dict:
         """Get cost and usage data from AWS Cost Explorer."""
+        params = {
+            'TimePeriod': {
+                'Start': start_date,
+                'End': end_date
+            },
+            'Granularity': 'DAILY',
+            'Metrics': ['BlendedCost'],
+            'GroupBy': [
+                {
+                    'Type': 'DIMENSION',
+                    'Key': 'SERVICE'
+                }
+            ]
+        }
+        cache_key = ce_cache_key('cost_and_usage', params)
+
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date,
-                    'End': end_date
-                },
-                Granularity='DAILY',
-                Metrics=['BlendedCost'],
-                GroupBy=[
-                    {
-                        'Type': 'DIMENSION',
-                        'Key': 'SERVICE'
-                    }
-                ]
+            response = await self._fetch_coalesced(
+                cache_key,
+                lambda: self._get_all_cost_and_usage(**params)
             )
+            cache_service.set(cache_key, response, expire=ce_cache_ttl(end_date))
             return response
         except Exception as e:
-            print(f"Error fetching cost data: {e}")
+            logger.error("Failed to fetch cost data", error=str(e))
             return {}
 
-    async def get_monthly_costs(self) -> Dict:
-        """Get current and previous month costs."""
-        now = datetime.now()
+    async def _fetch_monthly_costs(self) -> Dict:
+        """Get current and previous month costs from Cost Explorer, raising on failure."""
+        # Cost Explorer periods are UTC dates
+        now = datetime.now(timezone.utc)
         current_month_start = now.replace(day=1).strftime('%Y-%m-%d')
         current_month_end = now.strftime('%Y-%m-%d')
 
@@ -50,146 +255,163 @@ class AWSService:
         first_day_current_month = now.replace(day=1)
         last_month = first_day_current_month - timedelta(days=1)
         previous_month_start = last_month.replace(day=1).strftime('%Y-%m-%d')
-        previous_month_end = last_month.strftime('%Y-%m-%d')
-
-        try:
-            current_response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': current_month_start,
-                    'End': current_month_end
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost']
-            )
-
-            previous_response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': previous_month_start,
-                    'End': previous_month_end
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost']
-            )
 
-            current_cost = float(current_response['ResultsByTime'][0]['Total']['BlendedCost']['Amount']) if current_response['ResultsByTime'] else 0
-            previous_cost = float(previous_response['ResultsByTime'][0]['Total']['BlendedCost']['Amount']) if previous_response['ResultsByTime'] else 0
-
-            return {
-                'current_month': current_cost,
-                'last_month': previous_cost,
-                'projected': current_cost * 1.07,  # Simple projection
-                'savings_potential': current_cost * 0.25,  # Estimated 25% savings
-                'trend_percentage': ((current_cost - previous_cost) / previous_cost * 100) if previous_cost > 0 else 0
-            }
-        except Exception as e:
-            print(f"Error fetching monthly costs: {e}")
-            # Return mock data for development
-            return {
-                'current_month': 45234.56,
-                'last_month': 42123.45,
-                'projected': 48500.00,
-                'savings_potential': 8234.00,
-                'trend_percentage': 7.3
-            }
-
-    async def get_service_costs(self) -> List[Dict]:
-        """Get cost breakdown by service."""
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-
-        try:
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date,
-                    'End': end_date
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost'],
-                GroupBy=[
-                    {
-                        'Type': 'DIMENSION',
-                        'Key': 'SERVICE'
-                    }
-                ]
-            )
-
-            services = []
-            total_cost = 0
+        # One MONTHLY query spanning both months returns a result per month
+        params = {
+            'TimePeriod': {
+                'Start': previous_month_start,
+                'End': current_month_end
+            },
+            'Granularity': 'MONTHLY',
+            'Metrics': ['BlendedCost']
+        }
+        cache_key = ce_cache_key('monthly_costs', params)
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._fetch_coalesced(
+            cache_key,
+            lambda: self._call(self.cost_explorer.get_cost_and_usage, **params)
+        )
 
-            for result in response.get('ResultsByTime', []):
-                for group in result.get('Groups', []):
-                    service = group['Keys'][0]
-                    cost = float(group['Metrics']['BlendedCost']['Amount'])
-                    total_cost += cost
-                    services.append({'service': service, 'cost': cost})
-
-            # Calculate percentages
-            for service in services:
-                service['percentage'] = (service['cost'] / total_cost * 100) if total_cost > 0 else 0
-                service['trend'] = (service['cost'] * 0.1) * (1 if service['cost'] > 1000 else -1)  # Mock trend
-
-            return sorted(services, key=lambda x: x['cost'], reverse=True)[:10]
-        except Exception as e:
-            print(f"Error fetching service costs: {e}")
-            # Return mock data for development
-            return [
-                {'service': 'EC2', 'cost': 20355.42, 'percentage': 45, 'trend': 5.2},
-                {'service': 'RDS', 'cost': 13570.37, 'percentage': 30, 'trend': -2.1},
-                {'service': 'S3', 'cost': 6785.18, 'percentage': 15, 'trend': 12.8},
-                {'service': 'Lambda', 'cost': 2261.73, 'percentage': 5, 'trend': 18.5},
-                {'service': 'CloudFront', 'cost': 2261.86, 'percentage': 5, 'trend': -8.3},
+        monthly_totals = {
+            result['TimePeriod']['Start']: float(result['Total']['BlendedCost']['Amount'])
+            for result in response.get('ResultsByTime', [])
+        }
+        current_cost = monthly_totals.get(current_month_start, 0)
+        previous_cost = monthly_totals.get(previous_month_start, 0)
+
+        monthly_costs = {
+            'current_month': current_cost,
+            'last_month': previous_cost,
+            'projected': current_cost * 1.07,  # Simple projection
+            'savings_potential': current_cost * 0.25,  # Estimated 25% savings
+            'trend_percentage': ((current_cost - previous_cost) / previous_cost * 100) if previous_cost > 0 else 0
+        }
+        cache_service.set(cache_key, monthly_costs, expire=ce_cache_ttl(current_month_end))
+        return monthly_costs
+
+    async def _fetch_service_costs(self) -> List[Dict]:
+        """Get cost breakdown by service from Cost Explorer, raising on failure."""
+        now = datetime.now(timezone.utc)
+        end_date = now.strftime('%Y-%m-%d')
+        start_date = (now - timedelta(days=30)).strftime('%Y-%m-%d')
+
+        params = {
+            'TimePeriod': {
+                'Start': start_date,
+                'End': end_date
+            },
+            'Granularity': 'MONTHLY',
+            'Metrics': ['BlendedCost'],
+            'GroupBy': [
+                {
+                    'Type': 'DIMENSION',
+                    'Key': 'SERVICE'
+                }
             ]
+        }
+        cache_key = ce_cache_key('service_costs', params)
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._fetch_coalesced(
+            cache_key,
+            lambda: self._get_all_cost_and_usage(**params)
+        )
+
+        groups = [
+            group
+            for result in response.get('ResultsByTime', [])
+            for group in result.get('Groups', [])
+        ]
+        # Cost Explorer returns amounts as strings; NumPy parses them in C rather than per-item float()
+        costs = np.array(
+            [group['Metrics']['BlendedCost']['Amount'] for group in groups],
+            dtype=np.float64
+        )
+        total_cost = costs.sum()
+        percentages = costs / total_cost * 100 if total_cost > 0 else np.zeros_like(costs)
+
+        # Partial sort: only the ten most expensive services are ordered
+        if len(costs) > 10:
+            top_idx = np.argpartition(-costs, 10)[:10]
+        else:
+            top_idx = np.arange(len(costs))
+        top_idx = top_idx[np.argsort(-costs[top_idx], kind='stable')]
+
+        top_services = []
+        for i in top_idx:
+            cost = float(costs[i])
+            top_services.append({
+                'service': groups[i]['Keys'][0],
+                'cost': cost,
+                'percentage': float(percentages[i]),
+                'trend': (cost * 0.1) * (1 if cost > 1000 else -1)  # Mock trend
+            })
+
+        cache_service.set(cache_key, top_services, expire=ce_cache_ttl(end_date))
+        return top_services
+
+    async def scan_waste(self) -> List[Dict]:
+        """Run all waste detectors concurrently and return their combined findings."""
+        volumes, elastic_ips, stopped_instances = await asyncio.gather(
+            self.find_unattached_volumes(),
+            self.find_unused_elastic_ips(),
+            self.find_stopped_instances(),
+        )
+        return volumes + elastic_ips + stopped_instances
 
     async def find_unattached_volumes(self) -> List[Dict]:
         """Find unattached EBS volumes."""
         try:
-            response = self.ec2.describe_volumes(
-                Filters=[
-                    {
-                        'Name': 'status',
-                        'Values': ['available']
-                    }
-                ]
-            )
+            return [item async for item in self.iter_unattached_volumes()]
+        except Exception as e:
+            logger.error("Failed to find unattached volumes", error=str(e))
+            return []
 
-            waste_items = []
-            for volume in response.get('Volumes', []):
+    async def iter_unattached_volumes(self) -> AsyncIterator[Dict]:
+        """Yield a waste item for each unattached EBS volume, one page at a time."""
+        scan_time = datetime.now(timezone.utc)
+        async for page in self._paginate(
+            self.ec2,
+            'describe_volumes',
+            Filters=[
+                {
+                    'Name': 'status',
+                    'Values': ['available']
+                }
+            ],
+            PaginationConfig={'PageSize': 500}
+        ):
+            for volume in page.get('Volumes', []):
                 size = volume.get('Size', 0)
                 volume_type = volume.get('VolumeType', 'gp2')
 
                 # Calculate monthly cost based on volume type and size
-                cost_per_gb = {
-                    'gp2': 0.10,
-                    'gp3': 0.08,
-                    'io1': 0.125,
-                    'io2': 0.125,
-                    'st1': 0.045,
-                    'sc1': 0.025
-                }.get(volume_type, 0.10)
+                cost_per_gb = _EBS_COST_PER_GB.get(volume_type, _EBS_DEFAULT_COST_PER_GB)
 
                 monthly_cost = size * cost_per_gb
 
-                waste_items.append({
+                yield {
                     'id': volume['VolumeId'],
                     'resource_type': 'EBS Volume',
                     'resource_id': volume['VolumeId'],
                     'monthly_cost': monthly_cost,
-                    'detected_at': datetime.now(),
+                    'detected_at': scan_time,
                     'remediated': False,
                     'action': f'Delete unused {volume_type} volume ({size}GB)'
-                })
-
-            return waste_items
-        except Exception as e:
-            print(f"Error finding unattached volumes: {e}")
-            return []
+                }
 
     async def find_unused_elastic_ips(self) -> List[Dict]:
         """Find unused Elastic IPs."""
         try:
-            response = self.ec2.describe_addresses()
+            response = await self._call(self.ec2.describe_addresses)
 
             waste_items = []
+            scan_time = datetime.now(timezone.utc)
             for address in response.get('Addresses', []):
                 if 'InstanceId' not in address and 'NetworkInterfaceId' not in address:
                     waste_items.append({
@@ -197,32 +419,41 @@ class AWSService:
                         'resource_type': 'Elastic IP',
                         'resource_id': address.get('PublicIp'),
                         'monthly_cost': 3.60,  # $0.005 per hour
-                        'detected_at': datetime.now(),
+                        'detected_at': scan_time,
                         'remediated': False,
                         'action': 'Release unused Elastic IP'
                     })
 
             return waste_items
         except Exception as e:
-            print(f"Error finding unused elastic IPs: {e}")
+            logger.error("Failed to find unused elastic IPs", error=str(e))
             return []
 
     async def find_stopped_instances(self) -> List[Dict]:
         """Find stopped EC2 instances that have been stopped for more than 7 days."""
         try:
-            response = self.ec2.describe_instances(
-                Filters=[
-                    {
-                        'Name': 'instance-state-name',
-                        'Values': ['stopped']
-                    }
-                ]
-            )
-
-            waste_items = []
-            cutoff_date = datetime.now() - timedelta(days=7)
+            return [item async for item in self.iter_stopped_instances()]
+        except Exception as e:
+            logger.error("Failed to find stopped instances", error=str(e))
+            return []
 
-            for reservation in response.get('Reservations', []):
+    async def iter_stopped_instances(self) -> AsyncIterator[Dict]:
+        """Yield a waste item for each long-stopped EC2 instance, one page at a time."""
+        scan_time = datetime.now(timezone.utc)
+        cutoff_date = scan_time - timedelta(days=7)
+
+        async for page in self._paginate(
+            self.ec2,
+            'describe_instances',
+            Filters=[
+                {
+                    'Name': 'instance-state-name',
+                    'Values': ['stopped']
+                }
+            ],
+            PaginationConfig={'PageSize': 500}
+        ):
+            for reservation in page.get('Reservations', []):
                 for instance in reservation.get('Instances', []):
                     launch_time = instance.get('LaunchTime')
                     if launch_time and launch_time < cutoff_date:
@@ -230,37 +461,19 @@ class AWSService:
                         instance_type = instance.get('InstanceType', 't2.micro')
                         estimated_monthly_cost = self._estimate_instance_cost(instance_type)
 
-                        waste_items.append({
+                        yield {
                             'id': instance['InstanceId'],
                             'resource_type': 'EC2 Instance',
                             'resource_id': instance['InstanceId'],
                             'monthly_cost': estimated_monthly_cost,
-                            'detected_at': datetime.now(),
+                            'detected_at': scan_time,
                             'remediated': False,
                             'action': f'Terminate stopped instance ({instance_type})'
-                        })
-
-            return waste_items
-        except Exception as e:
-            print(f"Error finding stopped instances: {e}")
-            return []
+                        }
 
     def _estimate_instance_cost(self, instance_type: str) -> float:
         """Estimate monthly cost for an instance type."""
-        # Simplified cost estimation - in production, use actual pricing API
-        cost_map = {
-            't2.micro': 8.47,
-            't2.small': 16.79,
-            't2.medium': 33.58,
-            't3.micro': 7.66,
-            't3.small': 15.33,
-            't3.medium': 30.66,
-            'm5.large': 69.35,
-            'm5.xlarge': 138.70,
-            'c5.large': 61.32,
-            'c5.xlarge': 122.63,
-        }
-        return cost_map.get(instance_type, 50.00)  # Default estimate
+        return _EC2_INSTANCE_COST_MAP.get(instance_type, _EC2_DEFAULT_INSTANCE_COST)
 
 
 # Global instance
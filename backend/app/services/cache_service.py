@@ -1,7 +1,16 @@
+import hashlib
+import io
 import json
 import pickle
-from datetime import datetime, timedelta
-from typing import Any, Optional, Dict, List, Union
+import socket
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Optional, Dict, List, Tuple, Union
+import msgpack
+import orjson
+from cachetools import LRUCache
 import redis
 import structlog
 from redis.exceptions import RedisError
@@ -10,49 +19,297 @@ from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Single-byte prefixes identifying how a cached value was encoded
+JSON_TAG = b'J'
+MSGPACK_TAG = b'M'
+PICKLE_TAG = b'P'  # legacy, read-only
+
+# Raised for values that can't be decoded: refused pickles, corrupt JSON or msgpack bodies
+UNDECODABLE_ERRORS = (pickle.UnpicklingError, ValueError)
+
+# msgpack extension type codes for values JSON cannot represent faithfully
+_EXT_DATETIME = 1
+_EXT_DECIMAL = 2
+_EXT_DATE = 3
+_EXT_SET = 4
+
+# Only these globals may be loaded from legacy pickled values
+_PICKLE_ALLOWED_GLOBALS = {
+    ('builtins', 'set'),
+    ('builtins', 'frozenset'),
+    ('builtins', 'complex'),
+    ('datetime', 'datetime'),
+    ('datetime', 'date'),
+    ('datetime', 'time'),
+    ('datetime', 'timedelta'),
+    ('datetime', 'timezone'),
+    ('decimal', 'Decimal'),
+    ('collections', 'OrderedDict'),
+}
+
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+SCAN_BATCH_SIZE = 500
+
+# Cost Explorer bills per request, so identical queries are served from Redis for this long
+CE_CACHE_TTL = 900
+# Cost Explorer keeps revising recent days for up to ~72h; ranges ending before that are cached for a day
+CE_SETTLED_AFTER_DAYS = 3
+CE_SETTLED_CACHE_TTL = 86400
+
+# Read-mostly key prefixes served from an in-process cache kept coherent by CLIENT TRACKING
+TRACKED_PREFIXES = ('cost_data:', 'recommendations:')
+INVALIDATION_CHANNEL = '__redis__:invalidate'
+TRACKING_HEALTH_CHECK_INTERVAL = 30
+
+# Atomically counts a request and reports whether the window's limit is exceeded
+RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if current > tonumber(ARGV[1]) then
+    return 1
+end
+return 0
+"""
+
+
+def _ext_encode(value: Any) -> msgpack.ExtType:
+    """Encode the non-native types allowed in the cache as msgpack extension types"""
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode('utf-8'))
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode('utf-8'))
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode('utf-8'))
+    if isinstance(value, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, msgpack.packb(list(value), default=_ext_encode, use_bin_type=True))
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _ext_decode(code: int, data: bytes) -> Any:
+    """Decode msgpack extension types written by _ext_encode"""
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode('utf-8'))
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode('utf-8'))
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode('utf-8'))
+    if code == _EXT_SET:
+        return set(msgpack.unpackb(data, ext_hook=_ext_decode, raw=False))
+    return msgpack.ExtType(code, data)
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler that refuses any global outside a small allow-list"""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in _PICKLE_ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from cache")
+
+
+def _restricted_pickle_loads(data: bytes) -> Any:
+    return _RestrictedUnpickler(io.BytesIO(data)).load()
+
+
+def ce_cache_key(kind: str, params: Dict[str, Any]) -> str:
+    """Content-addressed Redis key for a Cost Explorer query"""
+    params_digest = hashlib.blake2b(
+        json.dumps(params, sort_keys=True).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+    return f"ce:{kind}:{params_digest}"
+
+
+def ce_cache_ttl(end_date: str) -> int:
+    """TTL for a Cost Explorer query whose exclusive end date is end_date (YYYY-MM-DD)"""
+    settled_before = (datetime.now(timezone.utc).date() - timedelta(days=CE_SETTLED_AFTER_DAYS)).isoformat()
+    return CE_SETTLED_CACHE_TTL if end_date <= settled_before else CE_CACHE_TTL
+
 
 class CacheService:
     """Redis-based caching service for performance optimization"""
 
     def __init__(self):
         self.redis_client = None
+        self._rate_limit_script = None
+        self._local_cache: Optional[LRUCache] = None
+        self._local_cache_lock = threading.Lock()
+        # Bumped on every invalidation so reads racing with one never repopulate stale data
+        self._invalidation_epoch = 0
+        self._tracking_connections = []
         self._connect()
 
     def _connect(self):
         """Initialize Redis connection"""
         try:
-            self.redis_client = redis.Redis.from_url(
+            keepalive_options = {}
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                keepalive_options[socket.TCP_KEEPIDLE] = 60
+
+            # Bounded pool: bursts wait for a free connection instead of opening new ones
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
                 decode_responses=False,  # Handle binary data
                 socket_connect_timeout=5,
                 socket_timeout=5,
+                socket_keepalive=True,
+                socket_keepalive_options=keepalive_options,
                 retry_on_timeout=True,
-                health_check_interval=30
+                health_check_interval=30,
+                client_name='cost-sentinel'
             )
+            self.redis_client = redis.Redis(connection_pool=pool, single_connection_client=False)
             # Test connection
             self.redis_client.ping()
+            # Registered scripts run via EVALSHA and reload themselves on NOSCRIPT
+            self._rate_limit_script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
             logger.info("Redis connection established", redis_url=settings.REDIS_URL)
         except RedisError as e:
             logger.error("Failed to connect to Redis", error=str(e))
             self.redis_client = None
+            return
+
+        if settings.REDIS_CLIENT_CACHE_SIZE > 0:
+            self._enable_client_tracking()
+
+    def _enable_client_tracking(self):
+        """Enable server-assisted client-side caching for TRACKED_PREFIXES (Redis 6+)"""
+        # Both connections are held for the process lifetime, so they are opened outside the bounded pool.
+        # The subscribed listener can't answer a health-check PING; the listener thread checks the tracker instead
+        pool = self.redis_client.connection_pool
+        connection_kwargs = {**pool.connection_kwargs, 'health_check_interval': 0}
+        listener = pool.connection_class(**connection_kwargs)
+        tracker = pool.connection_class(**connection_kwargs)
+        try:
+            # Receives invalidation messages
+            listener.send_command('CLIENT', 'ID')
+            listener_id = listener.read_response()
+            listener.send_command('SUBSCRIBE', INVALIDATION_CHANNEL)
+            listener.read_response()
+
+            # Broadcast mode: notify on any write to a tracked prefix, redirected to the listener
+            prefix_args = []
+            for prefix in TRACKED_PREFIXES:
+                prefix_args.extend(('PREFIX', prefix))
+            tracker.send_command('CLIENT', 'TRACKING', 'ON', 'REDIRECT', listener_id, 'BCAST', *prefix_args)
+            tracker.read_response()
+        except (RedisError, OSError) as e:
+            logger.warning("Client-side caching unavailable", error=str(e))
+            listener.disconnect()
+            tracker.disconnect()
+            return
+
+        self._tracking_connections = [listener, tracker]
+        self._local_cache = LRUCache(maxsize=settings.REDIS_CLIENT_CACHE_SIZE)
+        threading.Thread(
+            target=self._listen_for_invalidations,
+            args=(listener, tracker),
+            name='redis-invalidations',
+            daemon=True
+        ).start()
+
+    def _disable_client_tracking(self):
+        """Stop serving local copies and close the tracking connections"""
+        with self._local_cache_lock:
+            self._invalidation_epoch += 1
+            if self._local_cache is not None:
+                self._local_cache.clear()
+            self._local_cache = None
+        for connection in self._tracking_connections:
+            connection.disconnect()
+        self._tracking_connections = []
+
+    def _listen_for_invalidations(self, listener, tracker):
+        """Evict local copies as Redis reports changes to tracked keys"""
+        last_health_check = time.monotonic()
+        try:
+            while True:
+                if time.monotonic() - last_health_check >= TRACKING_HEALTH_CHECK_INTERVAL:
+                    # Tracking state lives on the tracker connection; if it drops, Redis silently stops invalidating
+                    tracker.send_command('PING')
+                    tracker.read_response()
+                    last_health_check = time.monotonic()
+
+                if not listener.can_read(timeout=1):
+                    continue
+                message = listener.read_response()
+                if not isinstance(message, list) or message[0] != b'message':
+                    continue
+
+                keys = message[2]
+                with self._local_cache_lock:
+                    self._invalidation_epoch += 1
+                    if keys is None:
+                        # Sent on FLUSHDB/FLUSHALL
+                        self._local_cache.clear()
+                    else:
+                        for key in keys:
+                            self._local_cache.pop(key.decode('utf-8'), None)
+        except (RedisError, OSError) as e:
+            logger.error("Client-side cache invalidation stream lost", error=str(e))
+        finally:
+            # Without invalidations local copies could go stale, so stop serving them
+            self._disable_client_tracking()
+
+    def _get_tracked(self, key: str) -> Optional[bytes]:
+        """Read a tracked key from the local cache, falling back to Redis"""
+        with self._local_cache_lock:
+            local_cache = self._local_cache
+            value = local_cache.get(key) if local_cache is not None else None
+            epoch = self._invalidation_epoch
+        if value is not None:
+            return value
+
+        value = self.redis_client.get(key)
+        if value is not None:
+            with self._local_cache_lock:
+                if self._local_cache is not None and self._invalidation_epoch == epoch:
+                    self._local_cache[key] = value
+        return value
+
+    def _evict_local(self, key: str):
+        """Drop a key written by this process before its invalidation message arrives"""
+        if self._local_cache is None or not key.startswith(TRACKED_PREFIXES):
+            return
+        with self._local_cache_lock:
+            self._invalidation_epoch += 1
+            if self._local_cache is not None:
+                self._local_cache.pop(key, None)
 
     def _serialize(self, value: Any) -> bytes:
-        """Serialize value for Redis storage"""
+        """Serialize value for Redis storage, prefixed with a format tag"""
         if isinstance(value, (dict, list)):
-            return json.dumps(value, default=str).encode('utf-8')
+            # orjson encodes datetime, UUID, enums and numpy natively; other types go through msgpack
+            try:
+                return JSON_TAG + orjson.dumps(value, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass
         elif isinstance(value, (str, int, float, bool)):
-            return json.dumps(value).encode('utf-8')
-        else:
-            return pickle.dumps(value)
+            return JSON_TAG + orjson.dumps(value)
+        return MSGPACK_TAG + msgpack.packb(value, default=_ext_encode, use_bin_type=True)
 
     def _deserialize(self, value: bytes) -> Any:
-        """Deserialize value from Redis storage"""
+        """Deserialize value from Redis storage by dispatching on its format tag"""
+        tag, body = value[:1], value[1:]
+        if tag == JSON_TAG:
+            return orjson.loads(body)
+        if tag == MSGPACK_TAG:
+            return msgpack.unpackb(body, ext_hook=_ext_decode, raw=False)
+        if tag == PICKLE_TAG:
+            return _restricted_pickle_loads(body)
+        return self._deserialize_legacy(value)
+
+    def _deserialize_legacy(self, value: bytes) -> Any:
+        """Deserialize values written before format tags were introduced"""
         try:
-            # Try JSON first (most common case)
             return json.loads(value.decode('utf-8'))
         except (json.JSONDecodeError, UnicodeDecodeError):
-            # Fall back to pickle
-            return pickle.loads(value)
+            return _restricted_pickle_loads(value)
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
@@ -60,10 +317,16 @@ class CacheService:
             return None
 
         try:
-            value = self.redis_client.get(key)
+            if self._local_cache is not None and key.startswith(TRACKED_PREFIXES):
+                value = self._get_tracked(key)
+            else:
+                value = self.redis_client.get(key)
             if value is None:
                 return None
             return self._deserialize(value)
+        except UNDECODABLE_ERRORS as e:
+            logger.warning("Refused undecodable cache value", key=key, error=str(e))
+            return None
         except RedisError as e:
             logger.error("Redis get failed", key=key, error=str(e))
             return None
@@ -80,7 +343,11 @@ class CacheService:
 
         try:
             serialized_value = self._serialize(value)
+            self._evict_local(key)
             return self.redis_client.set(key, serialized_value, ex=expire)
+        except TypeError as e:
+            logger.error("Unsupported cache value type", key=key, error=str(e))
+            return False
         except RedisError as e:
             logger.error("Redis set failed", key=key, error=str(e))
             return False
@@ -91,6 +358,7 @@ class CacheService:
             return False
 
         try:
+            self._evict_local(key)
             return bool(self.redis_client.delete(key))
         except RedisError as e:
             logger.error("Redis delete failed", key=key, error=str(e))
@@ -136,15 +404,24 @@ class CacheService:
 
         try:
             values = self.redis_client.mget(keys)
-            result = {}
-            for key, value in zip(keys, values):
-                if value is not None:
-                    result[key] = self._deserialize(value)
-            return result
         except RedisError as e:
             logger.error("Redis mget failed", keys=keys, error=str(e))
             return {}
 
+        # JSON is the common case, so decode it inline and dispatch everything else
+        loads = orjson.loads
+        deserialize = self._deserialize
+        result = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                result[key] = loads(value[1:]) if value[:1] == JSON_TAG else deserialize(value)
+            except UNDECODABLE_ERRORS as e:
+                # Skip only this key, like get() does
+                logger.warning("Refused undecodable cache value", key=key, error=str(e))
+        return result
+
     def set_many(
         self,
         mapping: Dict[str, Any],
@@ -160,18 +437,21 @@ class CacheService:
                 key: self._serialize(value)
                 for key, value in mapping.items()
             }
+            for key in serialized_mapping:
+                self._evict_local(key)
 
-            # Use pipeline for atomic operation
-            pipe = self.redis_client.pipeline()
-            pipe.mset(serialized_mapping)
-
-            # Set expiration if specified
             if expire:
-                for key in mapping.keys():
-                    pipe.expire(key, expire)
-
-            pipe.execute()
+                # SET ... EX assigns each key's TTL atomically with its value
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in serialized_mapping.items():
+                    pipe.set(key, value, ex=expire)
+                pipe.execute()
+            else:
+                self.redis_client.mset(serialized_mapping)
             return True
+        except TypeError as e:
+            logger.error("Unsupported cache value type", error=str(e))
+            return False
         except RedisError as e:
             logger.error("Redis mset failed", error=str(e))
             return False
@@ -182,10 +462,23 @@ class CacheService:
             return 0
 
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            # SCAN walks the keyspace in bounded chunks instead of blocking Redis like KEYS,
+            # and UNLINK frees memory in the background
+            pipe = self.redis_client.pipeline(transaction=False)
+            batch = []
+            cursor = 0
+            while True:
+                cursor, keys = self.redis_client.scan(cursor=cursor, match=pattern, count=SCAN_BATCH_SIZE)
+                batch.extend(keys)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    pipe.unlink(*batch)
+                    batch.clear()
+                if cursor == 0:
+                    break
+
+            if batch:
+                pipe.unlink(*batch)
+            return sum(pipe.execute())
         except RedisError as e:
             logger.error("Redis pattern delete failed", pattern=pattern, error=str(e))
             return 0
@@ -213,6 +506,63 @@ class CacheService:
             logger.error("Redis info failed", error=str(e))
             return {}
 
+    # Stream helpers for append-only logs
+
+    def stream_append_many(
+        self,
+        entries: List[Tuple[str, Any]],
+        maxlen: int = 1000,
+        expire: Optional[int] = None
+    ) -> bool:
+        """Append (stream, value) entries with approximate MAXLEN trimming in one round-trip"""
+        if not self.redis_client or not entries:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            streams = set()
+            for stream, value in entries:
+                pipe.xadd(stream, {'data': self._serialize(value)}, maxlen=maxlen, approximate=True)
+                streams.add(stream)
+            if expire:
+                for stream in streams:
+                    pipe.expire(stream, expire)
+            pipe.execute()
+            return True
+        except TypeError as e:
+            logger.error("Unsupported cache value type", error=str(e))
+            return False
+        except RedisError as e:
+            logger.error("Redis stream append failed", error=str(e))
+            return False
+
+    def stream_latest(self, streams: List[str], count: int) -> Dict[str, List[Any]]:
+        """Read up to count newest values from each stream, newest first"""
+        if not self.redis_client or not streams:
+            return {}
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for stream in streams:
+                pipe.xrevrange(stream, count=count)
+            results = pipe.execute()
+        except RedisError as e:
+            logger.error("Redis stream read failed", error=str(e))
+            return {}
+
+        latest = {}
+        for stream, entries in zip(streams, results):
+            values = []
+            for entry_id, fields in entries:
+                try:
+                    values.append(self._deserialize(fields[b'data']))
+                except UNDECODABLE_ERRORS as e:
+                    # Skip only this entry, like get_many() does
+                    logger.warning("Refused undecodable cache value", key=stream, entry_id=entry_id, error=str(e))
+            if values:
+                latest[stream] = values
+        return latest
+
     # Specialized cache methods for common use cases
 
     def cache_report_info(self, account_id: str, report_info: Dict[str, Any], ttl: int = 86400) -> bool:
@@ -331,19 +681,7 @@ class CacheService:
 
         key = f"rate_limit:{identifier}"
         try:
-            current = self.redis_client.get(key)
-            if current is None:
-                # First request
-                self.redis_client.setex(key, window, 1)
-                return False
-
-            current_count = int(current)
-            if current_count >= limit:
-                return True
-
-            # Increment counter
-            self.redis_client.incr(key)
-            return False
+            return bool(self._rate_limit_script(keys=[key], args=[limit, window]))
         except RedisError as e:
             logger.error("Rate limit check failed", key=key, error=str(e))
             return False
@@ -358,8 +696,10 @@ class CacheService:
 
         key = f"rate_limit:{identifier}"
         try:
-            current = self.redis_client.get(key)
-            ttl = self.redis_client.ttl(key)
+            pipe = self.redis_client.pipeline()
+            pipe.get(key)
+            pipe.ttl(key)
+            current, ttl = pipe.execute()
 
             return {
                 "current": int(current) if current else None,
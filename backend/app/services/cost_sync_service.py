@@ -1,11 +1,15 @@
 import asyncio
+import functools
+from contextlib import asynccontextmanager
 from datetime import datetime, date, timedelta
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, delete, and_, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import pandas as pd
 import structlog
 
-from app.db.base import get_database
+from app.db.base import AsyncSessionLocal, async_engine, get_database
 from app.models.aws_account import AWSAccount, AWSAccountStatus
 from app.models.cost_data import CostData
 from app.services.aws_client import aws_cost_explorer
@@ -13,12 +17,145 @@ from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Rows per upsert call; keeps bind parameters well under Postgres' 32767 limit
+UPSERT_BATCH_SIZE = 1000
+
+# Bulk syncs back off when the DB pool is this busy, leaving connections for API requests
+POOL_PRESSURE_THRESHOLD = 0.8
+POOL_POLL_INTERVAL = 5  # seconds
+
+# Offending rows included with integrity issues
+NEGATIVE_COST_SAMPLE_SIZE = 20
+
+# Cost Explorer pages fetched ahead of the page being written to the DB
+PAGE_PREFETCH_DEPTH = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _cost_upsert():
+    """Build the cost upsert on first use; every batch then reuses the same compiled statement"""
+    stmt = pg_insert(CostData)
+    return stmt.on_conflict_do_update(
+        # Must match the uq_cost_data_grain index expressions for Postgres to infer the conflict target
+        index_elements=[
+            CostData.account_id,
+            CostData.date,
+            CostData.service,
+            CostData.region,
+            func.coalesce(CostData.usage_type, literal_column("''")),
+            func.coalesce(CostData.operation, literal_column("''")),
+        ],
+        set_={'cost': stmt.excluded.cost},
+        # Unchanged rows are skipped entirely and not returned
+        where=CostData.cost.op('<>')(stmt.excluded.cost)
+    ).returning(literal_column('xmax = 0').label('inserted'))
+
+
+def _amount_column(df: pd.DataFrame, metric: str) -> pd.Series:
+    """Parse a Cost Explorer metric amount column, treating missing values as zero"""
+    column = f'Metrics.{metric}.Amount'
+    if column not in df:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[column], errors='coerce').fillna(0.0)
+
+
+def _decode_cost_rows(results_by_time: list, account_id: Any) -> List[dict]:
+    """Flatten Cost Explorer ResultsByTime into cost rows, skipping amounts of $0.01 or less"""
+    results_with_groups = [result for result in results_by_time if result.get('Groups')]
+    if not results_with_groups:
+        return []
+
+    # Vectorized decode: one frame row per group, amounts parsed column-wise
+    df = pd.json_normalize(results_with_groups, record_path='Groups', meta=[['TimePeriod', 'Start']])
+    blended = _amount_column(df, 'BlendedCost')
+    unblended = _amount_column(df, 'UnblendedCost')
+
+    # Blended cost is primary; fall back to unblended when it is not positive
+    amount = blended.where(blended > 0, unblended)
+    keep = amount > 0.01
+    if not keep.any():
+        return []
+
+    df = df.loc[keep]
+    # Groups are keyed [service, region]; rows without a region are stored as global spend
+    return pd.DataFrame({
+        'account_id': account_id,
+        'date': pd.to_datetime(df['TimePeriod.Start']).dt.date,
+        'service': df['Keys'].str[0].fillna('Other'),
+        'region': df['Keys'].str[1].fillna('global'),
+        'cost': amount[keep]
+    }).to_dict('records')
+
+
+async def _prefetched(source: AsyncIterator[Any], depth: int) -> AsyncIterator[Any]:
+    """Iterate source while a background task reads up to depth items ahead of the consumer"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    done = object()
+
+    async def produce():
+        try:
+            async for item in source:
+                # Blocks while the consumer is behind, so memory stays bounded to depth items
+                await queue.put((item, None))
+            await queue.put((done, None))
+        except Exception as e:
+            await queue.put((done, e))
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        producer.cancel()
+
+
+class AdmissionController:
+    """Concurrency gate whose limit can be changed safely while slots are held"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            while self.in_flight >= self.limit:
+                await self._condition.wait()
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify(1)
+
+    async def set_limit(self, limit: int) -> None:
+        """Change the limit; shrinking lets in-flight work drain rather than cancelling it"""
+        async with self._condition:
+            grew = limit > self.limit
+            self.limit = max(1, limit)
+            if grew:
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
 
 class CostSyncService:
     """Service for syncing cost data from AWS automatically"""
 
     def __init__(self):
-        self.sync_in_progress = set()  # Track accounts currently being synced
+        self.sync_in_progress: Dict[Tuple[str, date, date], asyncio.Task] = {}  # In-flight syncs by account and window
+        self.admission = AdmissionController(settings.COST_SYNC_MAX_CONCURRENCY)
 
     async def sync_account_costs(
         self,
@@ -27,138 +164,182 @@ class CostSyncService:
         end_date: Optional[date] = None,
         db: AsyncSession = None
     ) -> dict:
-        """Sync cost data for a single account"""
-
-        if str(account.id) in self.sync_in_progress:
-            logger.warning("Sync already in progress for account", account_id=account.account_id)
-            return {"status": "already_syncing", "account_id": account.account_id}
-
-        self.sync_in_progress.add(str(account.id))
+        """Sync cost data for a single account, joining any sync already running for the same window"""
+        # Set default date range (last 7 days)
+        if not end_date:
+            end_date = date.today()
+        if not start_date:
+            start_date = end_date - timedelta(days=7)
+
+        key = (str(account.id), start_date, end_date)
+        running = self.sync_in_progress.get(key)
+        if running is not None:
+            # Reuse the in-flight sync's result rather than paying for a second Cost Explorer call
+            logger.info("Sync already in progress for account, awaiting its result", account_id=account.account_id)
+            return await asyncio.shield(running)
+
+        task = asyncio.ensure_future(self._run_account_sync(account, start_date, end_date, db))
+        self.sync_in_progress[key] = task
+        task.add_done_callback(lambda _: self.sync_in_progress.pop(key, None))
+        return await task
+
+    async def _run_account_sync(
+        self,
+        account: AWSAccount,
+        start_date: date,
+        end_date: date,
+        db: Optional[AsyncSession]
+    ) -> dict:
+        """Fetch, decode and store one account's costs for the given window"""
+        logger.info("Starting cost sync",
+                   account_id=account.account_id,
+                   start_date=start_date.isoformat(),
+                   end_date=end_date.isoformat())
 
         try:
-            # Set default date range (last 7 days)
-            if not end_date:
-                end_date = date.today()
-            if not start_date:
-                start_date = end_date - timedelta(days=7)
-
-            logger.info("Starting cost sync",
-                       account_id=account.account_id,
-                       start_date=start_date.isoformat(),
-                       end_date=end_date.isoformat())
-
-            # Update account status to syncing
-            account.status = AWSAccountStatus.SYNCING
+            # ON CONFLICT is Postgres-only; other dialects (e.g. SQLite in dev) merge against a prefetch
+            use_upsert = db is not None and db.bind.dialect.name == 'postgresql'
+            existing = None
+            if db and not use_upsert:
+                existing = await self._load_existing_costs(db, account, start_date, end_date)
+            records_processed = 0
+            records_created = 0
+            records_updated = 0
+
+            # Fetch cost data from AWS a page at a time, writing each page while the next one downloads
+            pages = aws_cost_explorer.iter_cost_and_usage(
+                start_date=start_date.isoformat(),
+                end_date=(end_date + timedelta(days=1)).isoformat(),
+                granularity='DAILY',
+                metrics=['BlendedCost', 'UnblendedCost'],
+                group_by=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}, {'Type': 'DIMENSION', 'Key': 'REGION'}],
+                account=account
+            )
+            async for results_by_time in _prefetched(pages, PAGE_PREFETCH_DEPTH):
+                rows = _decode_cost_rows(results_by_time, account.id)
+                records_processed += len(rows)
+
+                if db and rows:
+                    if use_upsert:
+                        created, updated = await self._upsert_cost_rows(db, rows)
+                    else:
+                        created, updated = self._merge_cost_rows(db, existing, rows)
+                    records_created += created
+                    records_updated += updated
+
+            # Update account status back to connected
+            account.status = AWSAccountStatus.CONNECTED
+            account.last_sync_at = datetime.utcnow()
+            account.error_message = None
+
+            # Commit cost data and status together
             if db:
-                await db.commit()
-
-            # Fetch cost data from AWS
-            try:
-                cost_data = await aws_cost_explorer.get_cost_and_usage(
-                    start_date=start_date.isoformat(),
-                    end_date=(end_date + timedelta(days=1)).isoformat(),
-                    granularity='DAILY',
-                    metrics=['BlendedCost', 'UnblendedCost'],
-                    group_by=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}],
-                    account=account
-                )
-
-                records_processed = 0
-                records_created = 0
-                records_updated = 0
-
-                # Process cost data
-                for result_by_time in cost_data.get('ResultsByTime', []):
-                    result_date = datetime.fromisoformat(result_by_time['TimePeriod']['Start']).date()
-
-                    for group in result_by_time.get('Groups', []):
-                        service_name = group['Keys'][0] if group['Keys'] else 'Other'
-                        blended_amount = float(group['Metrics'].get('BlendedCost', {}).get('Amount', 0))
-                        unblended_amount = float(group['Metrics'].get('UnblendedCost', {}).get('Amount', 0))
-
-                        # Use blended cost as primary amount
-                        amount = blended_amount if blended_amount > 0 else unblended_amount
-
-                        if amount > 0.01:  # Only store costs > $0.01
-                            records_processed += 1
-
-                            # Check if record already exists
-                            if db:
-                                existing_query = await db.execute(
-                                    select(CostData).where(
-                                        and_(
-                                            CostData.account_id == account.id,
-                                            CostData.date == result_date,
-                                            CostData.service == service_name
-                                        )
-                                    )
-                                )
-                                existing_record = existing_query.scalar_one_or_none()
-
-                                if existing_record:
-                                    # Update existing record if amount changed
-                                    if abs(existing_record.amount - amount) > 0.01:
-                                        existing_record.amount = amount
-                                        existing_record.currency = 'USD'
-                                        existing_record.updated_at = datetime.utcnow()
-                                        records_updated += 1
-                                else:
-                                    # Create new record
-                                    cost_record = CostData(
-                                        account_id=account.id,
-                                        date=result_date,
-                                        service=service_name,
-                                        amount=amount,
-                                        currency='USD'
-                                    )
-                                    db.add(cost_record)
-                                    records_created += 1
-
-                # Commit all changes
-                if db:
+                if records_created or records_updated:
                     await db.commit()
+                else:
+                    await self._commit_metadata(db)
+
+            result = {
+                "status": "success",
+                "account_id": account.account_id,
+                "records_processed": records_processed,
+                "records_created": records_created,
+                "records_updated": records_updated,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat()
+            }
 
-                # Update account status back to connected
-                account.status = AWSAccountStatus.CONNECTED
-                account.last_sync_at = datetime.utcnow()
-                account.error_message = None
+            logger.info("Cost sync completed successfully", **result)
+            return result
 
-                if db:
-                    await db.commit()
+        except Exception as e:
+            # Read before rollback expires the instance, so the error path never lazy-loads
+            account_id = account.account_id
+            logger.error("Cost sync failed",
+                       account_id=account_id,
+                       error=str(e))
 
-                result = {
-                    "status": "success",
-                    "account_id": account.account_id,
-                    "records_processed": records_processed,
-                    "records_created": records_created,
-                    "records_updated": records_updated,
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat()
-                }
-
-                logger.info("Cost sync completed successfully", **result)
-                return result
+            # Discard any partial cost writes, then record the error status
+            try:
+                if db:
+                    await db.rollback()
+                    await db.refresh(account)
 
-            except Exception as e:
-                # Update account with error status
                 account.status = AWSAccountStatus.ERROR
                 account.error_message = str(e)
 
                 if db:
+                    # The ERROR status is the only persisted record of the failure, so keep the commit durable
                     await db.commit()
+            except Exception as status_error:
+                logger.error("Failed to record cost sync error status",
+                           account_id=account_id,
+                           error=str(status_error))
 
-                logger.error("Cost sync failed",
-                           account_id=account.account_id,
-                           error=str(e))
+            return {
+                "status": "error",
+                "account_id": account_id,
+                "error": str(e)
+            }
 
-                return {
-                    "status": "error",
-                    "account_id": account.account_id,
-                    "error": str(e)
-                }
+    async def _commit_metadata(self, db: AsyncSession) -> None:
+        """Commit a metadata-only transaction without waiting for the WAL flush"""
+        # Only used for successful syncs that wrote no rows: last_sync_at is rewritten by the next sync
+        if db.bind.dialect.name == 'postgresql':
+            await db.execute(text("SET LOCAL synchronous_commit = off"))
+        await db.commit()
+
+    async def _upsert_cost_rows(self, db: AsyncSession, rows: List[dict]) -> tuple:
+        """Upsert cost rows in executemany batches, returning (created, updated)"""
+        created = 0
+        changed = 0
+        # Core statements don't need the session flushed first; pending account
+        # changes go out once with the final commit instead of before every batch
+        with db.no_autoflush:
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                # Passing a parameter list lets the driver batch rows into multi-VALUES inserts
+                result = await db.execute(_cost_upsert(), rows[i:i + UPSERT_BATCH_SIZE])
+                inserted = result.scalars().all()
+                created += sum(1 for flag in inserted if flag)
+                changed += len(inserted)
+        return created, changed - created
+
+    async def _load_existing_costs(
+        self,
+        db: AsyncSession,
+        account: AWSAccount,
+        start_date: date,
+        end_date: date
+    ) -> dict:
+        """Load an account's cost rows for the sync window keyed by their grain"""
+        with db.no_autoflush:
+            result = await db.execute(
+                select(CostData).where(
+                    and_(
+                        CostData.account_id == account.id,
+                        CostData.date.between(start_date, end_date)
+                    )
+                )
+            )
+        return {
+            (record.date, record.service, record.region, record.usage_type, record.operation): record
+            for record in result.scalars().all()
+        }
 
-        finally:
-            self.sync_in_progress.discard(str(account.id))
+    def _merge_cost_rows(self, db: AsyncSession, existing: dict, rows: List[dict]) -> tuple:
+        """Apply cost rows against prefetched records without per-row queries, returning (created, updated)"""
+        insert_buffer = []
+        updated = 0
+        for row in rows:
+            # Synced rows carry no usage_type/operation
+            record = existing.get((row["date"], row["service"], row["region"], None, None))
+            if record is None:
+                insert_buffer.append(CostData(**row))
+            elif abs(float(record.cost) - row["cost"]) > 0.01:
+                record.cost = row["cost"]
+                updated += 1
+        db.add_all(insert_buffer)
+        return len(insert_buffer), updated
 
     async def sync_all_connected_accounts(
         self,
@@ -169,7 +350,7 @@ class CostSyncService:
 
         results = []
 
-        # Get database session
+        # Load accounts up front so this session is closed before the workers start
         async with get_database() as db:
             # Get all connected accounts
             query = select(AWSAccount).where(
@@ -179,58 +360,102 @@ class CostSyncService:
                 )
             )
             result = await db.execute(query)
-            accounts = result.scalars().all()
-
-            logger.info("Starting bulk cost sync", account_count=len(accounts))
+            accounts = list(result.scalars().all())
 
-            # Process accounts concurrently (but with limited concurrency)
-            semaphore = asyncio.Semaphore(3)  # Max 3 concurrent syncs
+        logger.info("Starting bulk cost sync", account_count=len(accounts))
 
-            async def sync_with_semaphore(account):
-                async with semaphore:
+        # Process accounts concurrently (but with limited concurrency)
+        async def sync_with_slot(account):
+            async with self.admission.slot():
+                # AsyncSession is not safe for concurrent use, so every sync gets its own
+                async with AsyncSessionLocal() as session:
+                    account = await session.merge(account, load=False)
                     return await self.sync_account_costs(
                         account=account,
                         start_date=start_date,
                         end_date=end_date,
-                        db=db
+                        db=session
                     )
 
-            # Execute all syncs concurrently
-            sync_tasks = [sync_with_semaphore(account) for account in accounts]
-            results = await asyncio.gather(*sync_tasks, return_exceptions=True)
-
-            # Process results
-            successful_syncs = 0
-            failed_syncs = 0
-
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error("Account sync failed with exception",
-                               account_id=accounts[i].account_id,
-                               error=str(result))
-                    failed_syncs += 1
-                    results[i] = {
-                        "status": "error",
-                        "account_id": accounts[i].account_id,
-                        "error": str(result)
-                    }
-                elif result.get("status") == "success":
-                    successful_syncs += 1
-                else:
-                    failed_syncs += 1
+        pool_watcher = asyncio.create_task(self._watch_pool_pressure())
+
+        # Keep only a bounded window of syncs in flight and collect results as they finish,
+        # so finished syncs release their account and cost payloads straight away
+        successful_syncs = 0
+        failed_syncs = 0
+        try:
+            max_pending = settings.COST_SYNC_MAX_CONCURRENCY * 2
+            accounts_iter = iter(accounts)
+            pending = {}
+
+            while True:
+                for account in accounts_iter:
+                    pending[asyncio.create_task(sync_with_slot(account))] = account.account_id
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    account_id = pending.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        logger.error("Account sync failed with exception",
+                                   account_id=account_id,
+                                   error=str(error))
+                        failed_syncs += 1
+                        results.append({
+                            "status": "error",
+                            "account_id": account_id,
+                            "error": str(error)
+                        })
+                        continue
+
+                    result = task.result()
+                    results.append(result)
+                    if result.get("status") == "success":
+                        successful_syncs += 1
+                    else:
+                        failed_syncs += 1
+        finally:
+            pool_watcher.cancel()
+            await self.admission.set_limit(settings.COST_SYNC_MAX_CONCURRENCY)
 
-            logger.info("Bulk cost sync completed",
-                       total_accounts=len(accounts),
-                       successful=successful_syncs,
-                       failed=failed_syncs)
+        logger.info("Bulk cost sync completed",
+                   total_accounts=len(accounts),
+                   successful=successful_syncs,
+                   failed=failed_syncs)
 
         return results
 
+    def _pool_limited_concurrency(self) -> int:
+        """Sync concurrency allowed by current DB pool utilization"""
+        max_concurrency = settings.COST_SYNC_MAX_CONCURRENCY
+        pool = async_engine.pool
+        # Pools without a fixed size (e.g. NullPool) give no saturation signal
+        if not hasattr(pool, 'size') or not pool.size():
+            return max_concurrency
+
+        utilization = pool.checkedout() / pool.size()
+        if utilization <= POOL_PRESSURE_THRESHOLD:
+            return max_concurrency
+        return max(1, max_concurrency - int(utilization * max_concurrency))
+
+    async def _watch_pool_pressure(self):
+        """Resize the sync admission limit as DB pool pressure changes"""
+        while True:
+            limit = self._pool_limited_concurrency()
+            if limit != self.admission.limit:
+                logger.info("Adjusting cost sync concurrency", limit=limit)
+                await self.admission.set_limit(limit)
+            await asyncio.sleep(POOL_POLL_INTERVAL)
+
     async def get_sync_status(self, account_id: str) -> dict:
         """Get sync status for an account"""
         return {
             "account_id": account_id,
-            "is_syncing": account_id in self.sync_in_progress
+            "is_syncing": any(key[0] == account_id for key in self.sync_in_progress)
         }
 
     async def cleanup_old_cost_data(self, days_to_keep: int = 400) -> dict:
@@ -239,30 +464,20 @@ class CostSyncService:
         cutoff_date = date.today() - timedelta(days=days_to_keep)
 
         async with get_database() as db:
-            # Count records to be deleted
-            count_query = select(func.count(CostData.id)).where(
-                CostData.date < cutoff_date
+            # Single set-based DELETE; no rows are loaded into the session
+            result = await db.execute(
+                delete(CostData).where(CostData.date < cutoff_date)
             )
-            count_result = await db.execute(count_query)
-            records_to_delete = count_result.scalar()
-
-            if records_to_delete > 0:
-                # Delete old records
-                delete_query = select(CostData).where(CostData.date < cutoff_date)
-                result = await db.execute(delete_query)
-                old_records = result.scalars().all()
-
-                for record in old_records:
-                    await db.delete(record)
-
-                await db.commit()
+            await db.commit()
+            records_deleted = result.rowcount
 
+            if records_deleted > 0:
                 logger.info("Cleaned up old cost data",
-                           records_deleted=records_to_delete,
+                           records_deleted=records_deleted,
                            cutoff_date=cutoff_date.isoformat())
 
             return {
-                "records_deleted": records_to_delete,
+                "records_deleted": records_deleted,
                 "cutoff_date": cutoff_date.isoformat()
             }
 
@@ -273,39 +488,61 @@ class CostSyncService:
 
         async with get_database() as db:
             # Check for negative costs
-            negative_costs_query = select(CostData).where(CostData.amount < 0)
-            negative_result = await db.execute(negative_costs_query)
-            negative_costs = negative_result.scalars().all()
+            negative_costs_query = select(func.count()).select_from(CostData).where(CostData.amount < 0)
+            negative_count = (await db.execute(negative_costs_query)).scalar_one()
 
-            if negative_costs:
+            if negative_count:
+                # A few examples are enough to investigate; never materialize the full set
+                samples_query = select(CostData).where(CostData.amount < 0).limit(NEGATIVE_COST_SAMPLE_SIZE)
+                samples = (await db.execute(samples_query)).scalars().all()
                 issues.append({
                     "type": "negative_costs",
-                    "count": len(negative_costs),
+                    "count": negative_count,
+                    "samples": [
+                        {
+                            "account_id": str(sample.account_id),
+                            "date": sample.date.isoformat(),
+                            "service": sample.service,
+                            "amount": float(sample.amount)
+                        }
+                        for sample in samples
+                    ],
                     "description": "Found negative cost values"
                 })
 
             # Check for unusually high costs (potential data quality issues)
             # Define "high" as more than 10x the median cost for the service
-            high_cost_query = select(
+            service_stats = select(
                 CostData.service,
                 func.percentile_cont(0.5).within_group(CostData.amount).label('median_cost'),
                 func.max(CostData.amount).label('max_cost')
             ).where(
                 CostData.date >= date.today() - timedelta(days=30)
-            ).group_by(CostData.service)
+            ).group_by(CostData.service).cte('service_stats')
+
+            # Filter in the database so only anomalous services come back
+            high_cost_query = select(
+                service_stats.c.service,
+                service_stats.c.median_cost,
+                service_stats.c.max_cost,
+                (service_stats.c.max_cost / service_stats.c.median_cost).label('ratio')
+            ).where(
+                and_(
+                    service_stats.c.median_cost > 1,
+                    service_stats.c.max_cost > service_stats.c.median_cost * 10
+                )
+            )
 
             high_cost_result = await db.execute(high_cost_query)
-            service_stats = high_cost_result.all()
-
-            anomalous_services = []
-            for stat in service_stats:
-                if stat.max_cost > stat.median_cost * 10 and stat.median_cost > 1:
-                    anomalous_services.append({
-                        "service": stat.service,
-                        "median_cost": float(stat.median_cost),
-                        "max_cost": float(stat.max_cost),
-                        "ratio": float(stat.max_cost / stat.median_cost)
-                    })
+            anomalous_services = [
+                {
+                    "service": stat.service,
+                    "median_cost": float(stat.median_cost),
+                    "max_cost": float(stat.max_cost),
+                    "ratio": float(stat.ratio)
+                }
+                for stat in high_cost_result
+            ]
 
             if anomalous_services:
                 issues.append({
@@ -1,6 +1,7 @@
 import asyncio
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import structlog
 
 from app.services.websocket_service import websocket_manager
@@ -9,12 +10,31 @@ from app.services.queue_service import queue_service, JobStatus
 
 logger = structlog.get_logger(__name__)
 
+EVENT_CACHE_TTL = 3600  # 1 hour since the last event of a type
+EVENT_STREAM_MAXLEN = 1000  # approximate cap on events kept per type
+EVENT_FLUSH_INTERVAL = 0.1  # seconds between buffered event writes
+EVENT_FLUSH_THRESHOLD = 64  # flush early once this many events are pending
+
+# High-frequency events that are not worth keeping in the recent-events cache
+NO_CACHE_EVENTS = frozenset({"job_status_changed"})
+
+# Job progress is logged at most this often per job; terminal statuses always log
+JOB_LOG_INTERVAL = 1.0  # seconds
+JOB_TERMINAL_STATUSES = frozenset(
+    status.value for status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+)
+
 
 class EventDispatcher:
     """Centralized event dispatcher for real-time notifications"""
 
     def __init__(self):
         self.event_handlers = {}
+        self._event_buffer: List[Tuple[str, Dict[str, Any]]] = []
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._bg_tasks: Set[asyncio.Task] = set()  # strong refs for fire-and-forget work
+        self._job_last_logged: Dict[str, float] = {}
         self._register_default_handlers()
 
     def _register_default_handlers(self):
@@ -34,39 +54,92 @@ class EventDispatcher:
         self.event_handlers[event_type] = handler
         logger.info("Event handler registered", event_type=event_type)
 
-    async def dispatch(self, event_type: str, data: Dict[str, Any]):
-        """Dispatch event to registered handlers"""
-        if event_type not in self.event_handlers:
+    async def dispatch(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Dispatch event to registered handlers, returning whether it was handled"""
+        handler = self.event_handlers.get(event_type)
+        if handler is None:
             logger.warning("No handler registered for event", event_type=event_type)
-            return
+            return False
 
         try:
-            handler = self.event_handlers[event_type]
             await handler(data)
 
             # Cache recent events for debugging
-            await self._cache_event(event_type, data)
+            if event_type not in NO_CACHE_EVENTS:
+                self._cache_event(event_type, data)
+            return True
 
         except Exception as e:
             logger.error("Event handler failed",
                         event_type=event_type,
                         error=str(e))
+            return False
 
-    async def _cache_event(self, event_type: str, data: Dict[str, Any]):
-        """Cache recent events for debugging and analytics"""
-        try:
-            event_record = {
-                "type": event_type,
-                "data": data,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+    def _cache_event(self, event_type: str, data: Dict[str, Any]):
+        """Buffer recent events for debugging and analytics; appended to per-type Redis streams in batches"""
+        event_record = {
+            "type": event_type,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+        self._event_buffer.append((f"events:{event_type}", event_record))
 
-            # Store in Redis with short TTL
-            cache_key = f"recent_events:{event_type}"
-            cache_service.set(cache_key, event_record, expire=3600)  # 1 hour
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if len(self._event_buffer) >= EVENT_FLUSH_THRESHOLD:
+            self._flush_wakeup.set()
 
+    async def _flush_loop(self):
+        """Periodically append buffered events to Redis in one pipelined call"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), EVENT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            if self._event_buffer:
+                batch, self._event_buffer = self._event_buffer, []
+                # Redis I/O runs on a worker thread so dispatch never waits on it
+                await asyncio.to_thread(self._write_events, batch)
+
+    def _flush_events(self):
+        """Write and clear the event buffer"""
+        if not self._event_buffer:
+            return
+
+        batch, self._event_buffer = self._event_buffer, []
+        self._write_events(batch)
+
+    def _write_events(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        try:
+            cache_service.stream_append_many(batch, maxlen=EVENT_STREAM_MAXLEN, expire=EVENT_CACHE_TTL)
         except Exception as e:
-            logger.error("Failed to cache event", error=str(e))
+            logger.error("Failed to cache events", error=str(e), count=len(batch))
+
+    def _run_in_background(self, func: Callable, *args, **kwargs):
+        """Run blocking cache maintenance on a worker thread without delaying the caller"""
+        task = asyncio.create_task(asyncio.to_thread(func, *args, **kwargs))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+
+    def _on_background_done(self, task: asyncio.Task):
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background event task failed", error=str(task.exception()))
+
+    async def close(self):
+        """Stop the flush loop, write any events still buffered and wait for background cache work"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self._flush_events()
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
 
     # Event Handlers
 
@@ -88,9 +161,9 @@ class EventDispatcher:
         )
 
         # Invalidate related cache entries
-        cache_service.invalidate_account_cache(account_id)
+        self._run_in_background(cache_service.invalidate_account_cache, account_id)
 
-        logger.info("Cost data update event processed",
+        logger.debug("Cost data update event processed",
                    user_id=user_id,
                    account_id=account_id)
 
@@ -112,7 +185,8 @@ class EventDispatcher:
         )
 
         # Cache waste scan results
-        cache_service.cache_waste_scan_results(
+        self._run_in_background(
+            cache_service.cache_waste_scan_results,
             account_id=account_id,
             scan_results={
                 "items": waste_items,
@@ -121,7 +195,7 @@ class EventDispatcher:
             }
         )
 
-        logger.info("Waste detection event processed",
+        logger.debug("Waste detection event processed",
                    user_id=user_id,
                    account_id=account_id,
                    items_count=len(waste_items))
@@ -145,12 +219,13 @@ class EventDispatcher:
 
         # Cache recommendations
         if account_id:
-            cache_service.cache_recommendations(
+            self._run_in_background(
+                cache_service.cache_recommendations,
                 account_id=account_id,
                 recommendations=recommendations
             )
 
-        logger.info("Recommendations event processed",
+        logger.debug("Recommendations event processed",
                    user_id=user_id,
                    account_id=account_id,
                    recommendations_count=len(recommendations))
@@ -174,6 +249,15 @@ class EventDispatcher:
             progress=progress
         )
 
+        # Progress updates can arrive many times a second; log each job at most once per interval
+        now = time.monotonic()
+        if status in JOB_TERMINAL_STATUSES:
+            self._job_last_logged.pop(job_id, None)
+        elif now - self._job_last_logged.get(job_id, 0.0) < JOB_LOG_INTERVAL:
+            return
+        else:
+            self._job_last_logged[job_id] = now
+
         logger.info("Job status change event processed",
                    user_id=user_id,
                    job_id=job_id,
@@ -200,9 +284,9 @@ class EventDispatcher:
 
         # Invalidate account cache if status is error
         if status in ["error", "disconnected"]:
-            cache_service.invalidate_account_cache(account_id)
+            self._run_in_background(cache_service.invalidate_account_cache, account_id)
 
-        logger.info("Account status change event processed",
+        logger.debug("Account status change event processed",
                    user_id=user_id,
                    account_id=account_id,
                    status=status)
@@ -233,7 +317,7 @@ class EventDispatcher:
                 "waste_items": results.get("items", [])
             })
 
-        logger.info("Sync completion event processed",
+        logger.debug("Sync completion event processed",
                    user_id=user_id,
                    account_id=account_id,
                    sync_type=sync_type)
@@ -277,7 +361,10 @@ class EventDispatcher:
                 tasks.append(task)
 
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # One summary line per batch instead of per-event INFO logs
+            failed = sum(1 for result in results if result is not True)
+            logger.info("Event batch dispatched", dispatched=len(tasks), failed=failed)
 
     # Convenience methods for common events
 
@@ -357,20 +444,17 @@ class EventDispatcher:
         event_type: Optional[str] = None,
         limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """Get recent events for monitoring"""
+        """Get recent events for monitoring, newest first"""
         events = []
 
         try:
-            if event_type:
-                # Get specific event type
-                cache_key = f"recent_events:{event_type}"
-                event_data = cache_service.get(cache_key)
-                if event_data:
-                    events.append(event_data)
-            else:
-                # Get all recent events (this is simplified)
-                # In production, you'd maintain a proper event log
-                pass
+            event_types = [event_type] if event_type else list(self.event_handlers)
+            streams = cache_service.stream_latest([f"events:{t}" for t in event_types], count=limit)
+            for stream_events in streams.values():
+                events.extend(stream_events)
+
+            if len(streams) > 1:
+                events.sort(key=lambda event: event["timestamp"], reverse=True)
 
         except Exception as e:
             logger.error("Failed to get recent events", error=str(e))
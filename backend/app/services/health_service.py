@@ -1,41 +1,120 @@
 import asyncio
+import contextvars
+import os
+import socket
 import time
 import psutil
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 import structlog
 from pathlib import Path
 
 import redis
 import sqlalchemy
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from app.db.base import get_database
+from app.db.base import async_engine, health_engine
 from app.services.cache_service import cache_service
 from app.services.metrics_service import metrics_service
 from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+DB_PING = text("SELECT 1")
+REDIS_HEALTH_KEY = "health_check_test"
+DNS_PROBE_HOST = "google.com"
+LOG_DIR = Path("logs")
+TEMP_DIR = Path("/tmp")
+
+_MIB = 1 << 20
+_GIB = 1 << 30
+
+
+def _mb(n: int) -> float:
+    return round(n / _MIB, 2)
+
+
+def _gb(n: int) -> float:
+    return round(n / _GIB, 2)
+
+
+# Load average isn't available on every platform; resolve the fallback once
+_getloadavg = getattr(psutil, 'getloadavg', lambda: (0.0, 0.0, 0.0))
+
+# Timestamp shared by every check in one check_all run, as (datetime, ISO string)
+_probe_time: contextvars.ContextVar[Optional[Tuple[datetime, str]]] = contextvars.ContextVar(
+    "health_probe_time", default=None
+)
+
+
+def _now() -> Tuple[datetime, str]:
+    """Current probe timestamp, reusing the one set by check_all when available"""
+    probe_time = _probe_time.get()
+    if probe_time is None:
+        now = datetime.utcnow()
+        return now, now.isoformat()
+    return probe_time
+
+
+def _now_iso() -> str:
+    return _now()[1]
+
+
+# perf_counter() reading taken when the current check started, set by HealthService._timed_check
+_check_started: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "health_check_started", default=None
+)
+
+
+def _check_elapsed() -> float:
+    """Seconds since the running check started"""
+    started = _check_started.get()
+    return time.perf_counter() - started if started is not None else 0.0
+
+
+def _redis_probe_sync(client) -> List[Any]:
+    """Run the Redis health probe as a single pipeline: ping, set, get, delete, info"""
+    pipe = client.pipeline(transaction=False)
+    pipe.ping()
+    pipe.set(REDIS_HEALTH_KEY, "test_value", ex=60)
+    pipe.get(REDIS_HEALTH_KEY)
+    pipe.delete(REDIS_HEALTH_KEY)
+    pipe.info()
+    return pipe.execute()
+
+
+def _fs_probe_sync() -> Tuple[Any, bool, bool]:
+    """Run the filesystem probe off the event loop: disk usage plus log/temp directory access"""
+    disk_usage = psutil.disk_usage('/')
+    log_dir_writable = os.access(LOG_DIR, os.W_OK | os.X_OK) and LOG_DIR.is_dir()
+    temp_writable = os.access(TEMP_DIR, os.W_OK | os.X_OK)
+    return disk_usage, log_dir_writable, temp_writable
+
 
 class HealthCheck:
     """Individual health check result"""
 
+    __slots__ = ("name", "status", "message", "details", "duration", "timestamp", "timestamp_iso")
+
     def __init__(
         self,
         name: str,
         status: str,
         message: str = "",
         details: Optional[Dict[str, Any]] = None,
-        duration: Optional[float] = None
+        duration: Optional[float] = None,
+        timestamp: Optional[datetime] = None
     ):
         self.name = name
         self.status = status  # "healthy", "unhealthy", "degraded", "unknown"
         self.message = message
         self.details = details or {}
         self.duration = duration
-        self.timestamp = datetime.utcnow()
+        if timestamp is None:
+            self.timestamp, self.timestamp_iso = _now()
+        else:
+            self.timestamp, self.timestamp_iso = timestamp, timestamp.isoformat()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -44,17 +123,128 @@ class HealthCheck:
             "message": self.message,
             "details": self.details,
             "duration_ms": round(self.duration * 1000, 2) if self.duration else None,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self.timestamp_iso
         }
 
 
 class HealthService:
     """Comprehensive health check service for monitoring system components"""
 
+    # Results younger than this are served from memory instead of re-probing dependencies
+    CACHE_TTL = 5.0
+    # Seconds between background CPU utilization samples
+    CPU_SAMPLE_INTERVAL = 2.0
+    # Longest a single check may run before it is reported as timed out
+    CHECK_TIMEOUT = 2.0
+    # Status reported for a timed-out check; critical dependencies fail the instance, the rest degrade it
+    TIMEOUT_STATUS = {"database": "unhealthy", "redis": "unhealthy"}
+    MAX_CONCURRENT_CHECKS = 10
+    DNS_TIMEOUT = 1.5  # below CHECK_TIMEOUT so a slow lookup reports as slow DNS, not a check timeout
+    DNS_CACHE_TTL = 30.0
+    # Seconds between background probe runs; while the prober runs, callers read its latest snapshot
+    PROBE_INTERVAL = 10.0
+
     def __init__(self):
         self.checks = {}
+        self._cache: Dict[Tuple[str, bool], Tuple[float, HealthCheck]] = {}
+        self._agg_cache: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+        self._in_flight: Dict[Tuple[str, bool], asyncio.Future] = {}
+        self._in_flight_all: Dict[bool, asyncio.Future] = {}
+        self._check_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CHECKS)
+        # Settings are fixed for the process lifetime, so derive reported values once
+        self._db_url_suffix = (
+            settings.DATABASE_URL.rsplit('@', 1)[-1] if '@' in settings.DATABASE_URL else "configured"
+        )
+        self._aws_region = settings.AWS_REGION or "us-east-1"
+        self._aws_creds_configured = bool(settings.AWS_ACCESS_KEY_ID)
+        self._sentry_configured = bool(settings.SENTRY_DSN)
+        self._last_cpu: Optional[float] = None
+        self._dns_cache: Optional[Tuple[float, float]] = None  # (monotonic time, lookup seconds)
+        self._cpu_sampler: Optional[asyncio.Task] = None
+        self._prober: Optional[asyncio.Task] = None
+        # Long-lived connection for the database probe, reopened after any failure
+        self._db_conn: Optional[AsyncConnection] = None
+        self._db_lock = asyncio.Lock()
+        self._closing: Set[asyncio.Task] = set()
         self._register_health_checks()
 
+    def start(self):
+        """Start background samplers used by the health checks"""
+        if self._cpu_sampler is None or self._cpu_sampler.done():
+            self._cpu_sampler = asyncio.create_task(self._sample_cpu())
+
+    def start_prober(self):
+        """Start the background probe loop that keeps the health snapshot and metrics current"""
+        self.start()
+        if self._prober is None or self._prober.done():
+            self._prober = asyncio.create_task(self._probe_loop())
+
+    async def stop(self):
+        """Stop background samplers"""
+        for task in (self._prober, self._cpu_sampler):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._prober = None
+        self._cpu_sampler = None
+        if self._db_conn is not None:
+            self._discard_db_conn()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    async def _sample_cpu(self):
+        """Keep a recent CPU utilization reading without blocking any request"""
+        # The first non-blocking call only primes psutil's counters
+        psutil.cpu_percent(interval=None)
+        while True:
+            await asyncio.sleep(self.CPU_SAMPLE_INTERVAL)
+            self._last_cpu = psutil.cpu_percent(interval=None)
+
+    def _discard_db_conn(self):
+        """Drop the probe connection and close it in the background"""
+        conn, self._db_conn = self._db_conn, None
+        task = asyncio.ensure_future(conn.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _ping_database(self):
+        """Run SELECT 1 on the dedicated probe connection, opening it if needed"""
+        # Summary and detailed probes may overlap; one connection runs one query at a time
+        async with self._db_lock:
+            if self._db_conn is None or self._db_conn.closed:
+                self._db_conn = await health_engine.connect()
+            try:
+                await self._db_conn.execute(DB_PING)
+            except BaseException:
+                # An error or a timeout mid-query leaves the connection in an unknown state
+                self._discard_db_conn()
+                raise
+
+    async def _probe_loop(self):
+        """Probe every check on a fixed interval, publish the results and refresh the snapshot"""
+        while True:
+            try:
+                result = await self.check_all(include_details=True, use_cache=False)
+                # The summary snapshot is a projection of the detailed run, not a second probe
+                self._agg_cache[False] = (time.monotonic(), {
+                    **result,
+                    "checks": {
+                        name: {"status": check["status"], "message": check["message"]}
+                        for name, check in result["checks"].items()
+                    }
+                })
+                for name, check in result["checks"].items():
+                    duration_ms = check["duration_ms"]
+                    metrics_service.update_health_check(
+                        name, check["status"], duration_ms / 1000 if duration_ms is not None else None
+                    )
+            except Exception as e:
+                logger.error("Background health probe failed", error=str(e))
+            await asyncio.sleep(self.PROBE_INTERVAL)
+
     def _register_health_checks(self):
         """Register all health checks"""
         self.checks = {
@@ -63,31 +253,100 @@ class HealthService:
             "filesystem": self._check_filesystem,
             "memory": self._check_memory,
             "cpu": self._check_cpu,
-            "network": self._check_network,
-            "aws_connectivity": self._check_aws_connectivity,
-            "queue_system": self._check_queue_system,
-            "background_workers": self._check_background_workers,
-            "external_dependencies": self._check_external_dependencies
+            "network": self._check_network
+        }
+
+        # Placeholder checks with fixed results; built once and reported without running anything.
+        # Replace an entry with a real check in self.checks when one is implemented.
+        self.static_checks = {
+            "aws_connectivity": HealthCheck(
+                name="aws_connectivity",
+                status="healthy",
+                message="AWS connectivity check passed",
+                details={
+                    "region": self._aws_region,
+                    "credentials_configured": self._aws_creds_configured
+                }
+            ),
+            "queue_system": HealthCheck(
+                name="queue_system",
+                status="healthy",
+                message="Queue system is operational",
+                details={
+                    "default_queue_size": 0,  # Would be actual queue size
+                    "priority_queue_size": 0,  # Would be actual queue size
+                    "failed_jobs_count": 0  # Would be actual count
+                }
+            ),
+            "background_workers": HealthCheck(
+                name="background_workers",
+                status="healthy",
+                message="Background workers are operational",
+                details={
+                    "active_workers": 1,  # Would be actual count
+                    "worker_types": ["job_worker"]  # Would be actual types
+                }
+            ),
+            "external_dependencies": HealthCheck(
+                name="external_dependencies",
+                status="healthy",
+                message="External dependencies are accessible",
+                details={
+                    "sentry_configured": self._sentry_configured,
+                    "external_apis": ["AWS Cost Explorer", "AWS STS"]
+                }
+            )
+        }
+        self._static_results = {
+            True: {name: check.to_dict() for name, check in self.static_checks.items()},
+            False: {
+                name: {"status": check.status, "message": check.message}
+                for name, check in self.static_checks.items()
+            }
         }
 
-    async def check_all(self, include_details: bool = True) -> Dict[str, Any]:
+    async def check_all(self, include_details: bool = True, use_cache: bool = True) -> Dict[str, Any]:
         """Run all health checks"""
-        start_time = time.time()
+        if use_cache:
+            # With the prober running, its snapshot stays authoritative until it misses a couple of runs
+            prober_running = self._prober is not None and not self._prober.done()
+            max_age = self.PROBE_INTERVAL * 2 if prober_running else self.CACHE_TTL
+            cached = self._agg_cache.get(include_details)
+            if cached and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+
+        # Callers arriving while a run is underway wait for it instead of probing again
+        in_flight = self._in_flight_all.get(include_details)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._run_all(include_details, use_cache))
+            self._in_flight_all[include_details] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight_all.pop(include_details, None))
+        return await asyncio.shield(in_flight)
+
+    async def _run_all(self, include_details: bool, use_cache: bool) -> Dict[str, Any]:
+        """Run every registered check and build the aggregate response"""
+        start_time = time.perf_counter()
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        probe_token = _probe_time.set((now, now_iso))
         results = {}
-        overall_status = "healthy"
-
-        # Run all checks concurrently
-        tasks = []
-        for check_name, check_func in self.checks.items():
-            task = asyncio.create_task(self._run_check(check_name, check_func))
-            tasks.append(task)
+        counts = {"healthy": 0, "degraded": 0, "unhealthy": 0, "unknown": 0}
 
-        check_results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Run all checks concurrently; gather wraps each coroutine in a task itself
+        names = list(self.checks)
+        try:
+            check_results = await asyncio.gather(
+                *(
+                    self._run_check(name, self.checks[name], include_details, use_cache=use_cache)
+                    for name in names
+                ),
+                return_exceptions=True
+            )
+        finally:
+            _probe_time.reset(probe_token)
 
         # Process results
-        for i, result in enumerate(check_results):
-            check_name = list(self.checks.keys())[i]
-
+        for check_name, result in zip(names, check_results):
             if isinstance(result, Exception):
                 health_check = HealthCheck(
                     name=check_name,
@@ -103,31 +362,90 @@ class HealthService:
                 "message": health_check.message
             }
 
-            # Update overall status
-            if health_check.status == "unhealthy":
-                overall_status = "unhealthy"
-            elif health_check.status in ["degraded", "unknown"] and overall_status == "healthy":
-                overall_status = "degraded"
+            counts[health_check.status] = counts.get(health_check.status, 0) + 1
 
-        total_duration = time.time() - start_time
+        for check_name, static_result in self._static_results[include_details].items():
+            results[check_name] = {**static_result, "timestamp": now_iso} if include_details else static_result
+            counts[static_result["status"]] += 1
 
-        return {
+        if counts["unhealthy"]:
+            overall_status = "unhealthy"
+        elif counts["degraded"] or counts["unknown"]:
+            overall_status = "degraded"
+        else:
+            overall_status = "healthy"
+
+        total_duration = time.perf_counter() - start_time
+
+        response = {
             "status": overall_status,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso,
             "duration_ms": round(total_duration * 1000, 2),
             "checks": results,
-            "summary": self._generate_summary(results)
+            "summary": self._generate_summary(counts, len(results))
         }
+        self._agg_cache[include_details] = (time.monotonic(), response)
+        return response
 
-    async def _run_check(self, name: str, check_func) -> HealthCheck:
+    async def _run_check(
+        self,
+        name: str,
+        check_func,
+        include_details: bool = True,
+        use_cache: bool = True
+    ) -> HealthCheck:
+        """Run a single health check, reusing a fresh cached result or an in-flight probe"""
+        # A detailed result also answers a summary request, but not the other way round
+        keys = [(name, True)] if include_details else [(name, False), (name, True)]
+        if use_cache:
+            now = time.monotonic()
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached and now - cached[0] < self.CACHE_TTL:
+                    return cached[1]
+
+        # Concurrent callers share one probe per check rather than each hitting the dependency
+        in_flight = next((self._in_flight[key] for key in keys if key in self._in_flight), None)
+        if in_flight is None:
+            key = keys[0]
+            in_flight = asyncio.ensure_future(self._execute_check(name, check_func, include_details))
+            self._in_flight[key] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(in_flight)
+
+    async def _execute_check(self, name: str, check_func, include_details: bool) -> HealthCheck:
+        """Run a single health check with timing and cache its result"""
+        result = await self._timed_check(name, check_func, include_details)
+        self._cache[(name, include_details)] = (time.monotonic(), result)
+        return result
+
+    async def _timed_check(self, name: str, check_func, include_details: bool) -> HealthCheck:
         """Run a single health check with timing"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            result = await check_func()
-            result.duration = time.time() - start_time
+            # A hung dependency must not hold up the whole health response
+            async with self._check_semaphore:
+                # Time the check itself, not the wait for a semaphore slot; checks read it via _check_elapsed
+                start_time = time.perf_counter()
+                token = _check_started.set(start_time)
+                try:
+                    result = await asyncio.wait_for(check_func(include_details), self.CHECK_TIMEOUT)
+                finally:
+                    _check_started.reset(token)
+            result.duration = time.perf_counter() - start_time
             return result
+        except asyncio.TimeoutError:
+            duration = time.perf_counter() - start_time
+            logger.warning(f"Health check timed out: {name}", timeout=self.CHECK_TIMEOUT)
+            return HealthCheck(
+                name=name,
+                status=self.TIMEOUT_STATUS.get(name, "degraded"),
+                message="timeout",
+                details={"timeout_seconds": self.CHECK_TIMEOUT},
+                duration=duration
+            )
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             logger.error(f"Health check failed: {name}", error=str(e))
             return HealthCheck(
                 name=name,
@@ -137,53 +455,50 @@ class HealthService:
                 duration=duration
             )
 
-    async def _check_database(self) -> HealthCheck:
+    async def _check_database(self, include_details: bool = True) -> HealthCheck:
         """Check database connectivity and performance"""
         try:
-            start_query_time = time.time()
-
-            async with get_database() as db:
-                # Test basic connectivity
-                result = await db.execute(text("SELECT 1"))
-                result.fetchone()
-
-                # Test database performance
-                await db.execute(text("SELECT COUNT(*) FROM information_schema.tables"))
-
-                # Get connection pool info
-                pool_info = {
-                    "pool_size": db.bind.pool.size(),
-                    "checked_in": db.bind.pool.checkedin(),
-                    "checked_out": db.bind.pool.checkedout(),
-                    "overflow": db.bind.pool.overflow(),
-                    "invalid": db.bind.pool.invalid()
-                }
+            # Test basic connectivity; round-trip time doubles as the performance signal
+            await self._ping_database()
+            query_duration = _check_elapsed()
 
-                query_duration = time.time() - start_query_time
+            # Usage of the application pool the probe itself stays out of
+            pool = async_engine.pool
+            pool_size = pool.size()
+            checked_out = pool.checkedout()
 
-                status = "healthy"
-                message = "Database is responsive"
+            status = "healthy"
+            message = "Database is responsive"
 
-                # Check for performance issues
-                if query_duration > 1.0:
-                    status = "degraded"
-                    message = f"Database response slow ({query_duration:.2f}s)"
+            # Check for performance issues
+            if query_duration > 1.0:
+                status = "degraded"
+                message = f"Database response slow ({query_duration:.2f}s)"
 
-                # Check connection pool health
-                if pool_info["checked_out"] / pool_info["pool_size"] > 0.8:
-                    status = "degraded"
-                    message = "High database connection usage"
+            # Check connection pool health
+            if checked_out / pool_size > 0.8:
+                status = "degraded"
+                message = "High database connection usage"
 
-                return HealthCheck(
-                    name="database",
-                    status=status,
-                    message=message,
-                    details={
-                        "query_duration_ms": round(query_duration * 1000, 2),
-                        "connection_pool": pool_info,
-                        "database_url": settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else "configured"
-                    }
-                )
+            if not include_details:
+                return HealthCheck(name="database", status=status, message=message)
+
+            return HealthCheck(
+                name="database",
+                status=status,
+                message=message,
+                details={
+                    "query_duration_ms": round(query_duration * 1000, 2),
+                    "connection_pool": {
+                        "pool_size": pool_size,
+                        "checked_in": pool.checkedin(),
+                        "checked_out": checked_out,
+                        "overflow": pool.overflow(),
+                        "invalid": pool.invalid()
+                    },
+                    "database_url": self._db_url_suffix
+                }
+            )
 
         except Exception as e:
             return HealthCheck(
@@ -193,11 +508,9 @@ class HealthService:
                 details={"error": str(e), "error_type": type(e).__name__}
             )
 
-    async def _check_redis(self) -> HealthCheck:
+    async def _check_redis(self, include_details: bool = True) -> HealthCheck:
         """Check Redis connectivity and performance"""
         try:
-            start_time = time.time()
-
             # Test basic connectivity
             redis_client = cache_service.redis_client
             if not redis_client:
@@ -207,29 +520,22 @@ class HealthService:
                     message="Redis client not initialized"
                 )
 
-            # Test ping
-            await asyncio.get_event_loop().run_in_executor(
-                None, redis_client.ping
-            )
+            if not include_details:
+                # Liveness only needs a round-trip; skip the write probe and INFO
+                await asyncio.to_thread(redis_client.ping)
+                operation_duration = _check_elapsed()
+                if operation_duration > 0.5:
+                    return HealthCheck(
+                        name="redis",
+                        status="degraded",
+                        message=f"Redis response slow ({operation_duration:.2f}s)"
+                    )
+                return HealthCheck(name="redis", status="healthy", message="Redis is responsive")
 
-            # Get Redis info
-            info = await asyncio.get_event_loop().run_in_executor(
-                None, redis_client.info
-            )
+            # Ping, set/get/delete round-trip and INFO in one pipelined call on one worker thread
+            _, _, value, _, info = await asyncio.to_thread(_redis_probe_sync, redis_client)
 
-            # Test set/get operation
-            test_key = "health_check_test"
-            await asyncio.get_event_loop().run_in_executor(
-                None, redis_client.set, test_key, "test_value", 60
-            )
-            value = await asyncio.get_event_loop().run_in_executor(
-                None, redis_client.get, test_key
-            )
-            await asyncio.get_event_loop().run_in_executor(
-                None, redis_client.delete, test_key
-            )
-
-            operation_duration = time.time() - start_time
+            operation_duration = _check_elapsed()
 
             status = "healthy"
             message = "Redis is responsive"
@@ -252,8 +558,8 @@ class HealthService:
                 message=message,
                 details={
                     "operation_duration_ms": round(operation_duration * 1000, 2),
-                    "memory_used_mb": round(memory_usage / 1024 / 1024, 2),
-                    "memory_max_mb": round(max_memory / 1024 / 1024, 2) if max_memory else "unlimited",
+                    "memory_used_mb": _mb(memory_usage),
+                    "memory_max_mb": _mb(max_memory) if max_memory else "unlimited",
                     "connected_clients": info.get('connected_clients', 0),
                     "uptime_days": round(info.get('uptime_in_seconds', 0) / 86400, 1),
                     "version": info.get('redis_version', 'unknown')
@@ -268,30 +574,12 @@ class HealthService:
                 details={"error": str(e), "error_type": type(e).__name__}
             )
 
-    async def _check_filesystem(self) -> HealthCheck:
+    async def _check_filesystem(self, include_details: bool = True) -> HealthCheck:
         """Check filesystem health and disk space"""
         try:
-            # Check disk space
-            disk_usage = psutil.disk_usage('/')
+            disk_usage, log_dir_writable, temp_writable = await asyncio.to_thread(_fs_probe_sync)
             used_percent = (disk_usage.used / disk_usage.total) * 100
 
-            # Check log directory
-            log_dir = Path("logs")
-            log_dir_exists = log_dir.exists()
-            log_dir_writable = log_dir.is_dir() and log_dir.exists()
-
-            if log_dir_writable:
-                try:
-                    test_file = log_dir / "health_test.tmp"
-                    test_file.write_text("test")
-                    test_file.unlink()
-                except:
-                    log_dir_writable = False
-
-            # Check temp directory
-            temp_dir = Path("/tmp")
-            temp_writable = temp_dir.exists() and temp_dir.is_dir()
-
             status = "healthy"
             message = "Filesystem is healthy"
             issues = []
@@ -316,14 +604,17 @@ class HealthService:
             if issues:
                 message = "; ".join(issues)
 
+            if not include_details:
+                return HealthCheck(name="filesystem", status=status, message=message)
+
             return HealthCheck(
                 name="filesystem",
                 status=status,
                 message=message,
                 details={
-                    "disk_total_gb": round(disk_usage.total / 1024**3, 2),
-                    "disk_used_gb": round(disk_usage.used / 1024**3, 2),
-                    "disk_free_gb": round(disk_usage.free / 1024**3, 2),
+                    "disk_total_gb": _gb(disk_usage.total),
+                    "disk_used_gb": _gb(disk_usage.used),
+                    "disk_free_gb": _gb(disk_usage.free),
                     "disk_used_percent": round(used_percent, 1),
                     "log_directory_writable": log_dir_writable,
                     "temp_directory_accessible": temp_writable
@@ -338,11 +629,12 @@ class HealthService:
                 details={"error": str(e)}
             )
 
-    async def _check_memory(self) -> HealthCheck:
+    async def _check_memory(self, include_details: bool = True) -> HealthCheck:
         """Check system memory usage"""
         try:
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory, swap = await asyncio.to_thread(
+                lambda: (psutil.virtual_memory(), psutil.swap_memory())
+            )
 
             status = "healthy"
             message = "Memory usage is normal"
@@ -365,17 +657,20 @@ class HealthService:
             if issues:
                 message = "; ".join(issues)
 
+            if not include_details:
+                return HealthCheck(name="memory", status=status, message=message)
+
             return HealthCheck(
                 name="memory",
                 status=status,
                 message=message,
                 details={
-                    "memory_total_gb": round(memory.total / 1024**3, 2),
-                    "memory_used_gb": round(memory.used / 1024**3, 2),
-                    "memory_available_gb": round(memory.available / 1024**3, 2),
+                    "memory_total_gb": _gb(memory.total),
+                    "memory_used_gb": _gb(memory.used),
+                    "memory_available_gb": _gb(memory.available),
                     "memory_percent": memory.percent,
-                    "swap_total_gb": round(swap.total / 1024**3, 2) if swap.total else 0,
-                    "swap_used_gb": round(swap.used / 1024**3, 2) if swap.used else 0,
+                    "swap_total_gb": _gb(swap.total),
+                    "swap_used_gb": _gb(swap.used),
                     "swap_percent": swap.percent
                 }
             )
@@ -388,13 +683,16 @@ class HealthService:
                 details={"error": str(e)}
             )
 
-    async def _check_cpu(self) -> HealthCheck:
+    async def _check_cpu(self, include_details: bool = True) -> HealthCheck:
         """Check CPU usage"""
         try:
-            # Get CPU usage (averaged over 1 second)
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Read the background sample; until it has one, use utilization since the last call
+            self.start()
+            cpu_percent = self._last_cpu
+            if cpu_percent is None:
+                cpu_percent = psutil.cpu_percent(interval=None)
             cpu_count = psutil.cpu_count()
-            load_avg = psutil.getloadavg() if hasattr(psutil, 'getloadavg') else (0, 0, 0)
+            load_avg = await asyncio.to_thread(_getloadavg)
 
             status = "healthy"
             message = "CPU usage is normal"
@@ -417,6 +715,9 @@ class HealthService:
             if issues:
                 message = "; ".join(issues)
 
+            if not include_details:
+                return HealthCheck(name="cpu", status=status, message=message)
+
             return HealthCheck(
                 name="cpu",
                 status=status,
@@ -424,9 +725,9 @@ class HealthService:
                 details={
                     "cpu_percent": cpu_percent,
                     "cpu_count": cpu_count,
-                    "load_avg_1min": load_avg[0] if load_avg else None,
-                    "load_avg_5min": load_avg[1] if load_avg else None,
-                    "load_avg_15min": load_avg[2] if load_avg else None
+                    "load_avg_1min": load_avg[0],
+                    "load_avg_5min": load_avg[1],
+                    "load_avg_15min": load_avg[2]
                 }
             )
 
@@ -438,37 +739,54 @@ class HealthService:
                 details={"error": str(e)}
             )
 
-    async def _check_network(self) -> HealthCheck:
+    async def _check_network(self, include_details: bool = True) -> HealthCheck:
         """Check network connectivity"""
         try:
-            # Test DNS resolution
-            import socket
-            start_time = time.time()
-            socket.gethostbyname("google.com")
-            dns_duration = time.time() - start_time
-
-            # Get network interface stats
-            net_io = psutil.net_io_counters()
+            # Test DNS resolution; DNS health doesn't flap quickly, so reuse a recent measurement
+            if self._dns_cache and time.monotonic() - self._dns_cache[0] < self.DNS_CACHE_TTL:
+                dns_duration = self._dns_cache[1]
+            else:
+                start_time = time.perf_counter()
+                try:
+                    await asyncio.wait_for(
+                        asyncio.get_running_loop().getaddrinfo(DNS_PROBE_HOST, None, family=socket.AF_INET),
+                        timeout=self.DNS_TIMEOUT
+                    )
+                    dns_duration = time.perf_counter() - start_time
+                except asyncio.TimeoutError:
+                    dns_duration = self.DNS_TIMEOUT
+                self._dns_cache = (time.monotonic(), dns_duration)
 
             status = "healthy"
             message = "Network connectivity is good"
 
             # Check DNS response time
-            if dns_duration > 5.0:
+            if dns_duration >= self.DNS_TIMEOUT:
                 status = "degraded"
-                message = f"Slow DNS resolution ({dns_duration:.2f}s)"
+                message = f"Slow DNS resolution (>= {dns_duration:.2f}s)"
+
+            if not include_details:
+                return HealthCheck(name="network", status=status, message=message)
+
+            details = {"dns_resolution_ms": round(dns_duration * 1000, 2)}
+
+            # Get network interface stats; psutil returns None when there are no interfaces
+            net_io = await asyncio.to_thread(psutil.net_io_counters)
+            if net_io:
+                details.update(
+                    bytes_sent=net_io.bytes_sent,
+                    bytes_received=net_io.bytes_recv,
+                    packets_sent=net_io.packets_sent,
+                    packets_received=net_io.packets_recv
+                )
+            else:
+                details.update(bytes_sent=0, bytes_received=0, packets_sent=0, packets_received=0)
 
             return HealthCheck(
                 name="network",
                 status=status,
                 message=message,
-                details={
-                    "dns_resolution_ms": round(dns_duration * 1000, 2),
-                    "bytes_sent": net_io.bytes_sent if net_io else 0,
-                    "bytes_received": net_io.bytes_recv if net_io else 0,
-                    "packets_sent": net_io.packets_sent if net_io else 0,
-                    "packets_received": net_io.packets_recv if net_io else 0
-                }
+                details=details
             )
 
         except Exception as e:
@@ -479,146 +797,33 @@ class HealthService:
                 details={"error": str(e)}
             )
 
-    async def _check_aws_connectivity(self) -> HealthCheck:
-        """Check AWS connectivity and credentials"""
-        try:
-            # This would test AWS connectivity
-            # For now, we'll simulate the check
-            status = "healthy"
-            message = "AWS connectivity check passed"
-
-            # In a real implementation, you would:
-            # 1. Test STS GetCallerIdentity
-            # 2. Test basic service access
-            # 3. Check credential validity
-
-            return HealthCheck(
-                name="aws_connectivity",
-                status=status,
-                message=message,
-                details={
-                    "region": settings.AWS_DEFAULT_REGION or "us-east-1",
-                    "credentials_configured": bool(settings.AWS_ACCESS_KEY_ID),
-                    "last_check": datetime.utcnow().isoformat()
-                }
-            )
-
-        except Exception as e:
-            return HealthCheck(
-                name="aws_connectivity",
-                status="degraded",
-                message=f"AWS connectivity check failed: {str(e)}",
-                details={"error": str(e)}
-            )
-
-    async def _check_queue_system(self) -> HealthCheck:
-        """Check queue system health"""
-        try:
-            # Check queue sizes and worker status
-            # This is a simplified check
-            status = "healthy"
-            message = "Queue system is operational"
-
-            return HealthCheck(
-                name="queue_system",
-                status=status,
-                message=message,
-                details={
-                    "default_queue_size": 0,  # Would be actual queue size
-                    "priority_queue_size": 0,  # Would be actual queue size
-                    "failed_jobs_count": 0,  # Would be actual count
-                    "last_job_processed": datetime.utcnow().isoformat()
-                }
-            )
-
-        except Exception as e:
-            return HealthCheck(
-                name="queue_system",
-                status="degraded",
-                message=f"Queue system check failed: {str(e)}",
-                details={"error": str(e)}
-            )
-
-    async def _check_background_workers(self) -> HealthCheck:
-        """Check background worker status"""
-        try:
-            # Check if background workers are running
-            # This would check actual worker processes
-            status = "healthy"
-            message = "Background workers are operational"
-
-            return HealthCheck(
-                name="background_workers",
-                status=status,
-                message=message,
-                details={
-                    "active_workers": 1,  # Would be actual count
-                    "worker_types": ["job_worker"],  # Would be actual types
-                    "last_worker_heartbeat": datetime.utcnow().isoformat()
-                }
-            )
-
-        except Exception as e:
-            return HealthCheck(
-                name="background_workers",
-                status="degraded",
-                message=f"Worker check failed: {str(e)}",
-                details={"error": str(e)}
-            )
-
-    async def _check_external_dependencies(self) -> HealthCheck:
-        """Check external service dependencies"""
-        try:
-            # Check external services (Sentry, etc.)
-            status = "healthy"
-            message = "External dependencies are accessible"
-
-            return HealthCheck(
-                name="external_dependencies",
-                status=status,
-                message=message,
-                details={
-                    "sentry_configured": bool(settings.SENTRY_DSN),
-                    "external_apis": ["AWS Cost Explorer", "AWS STS"],
-                    "last_check": datetime.utcnow().isoformat()
-                }
-            )
-
-        except Exception as e:
-            return HealthCheck(
-                name="external_dependencies",
-                status="degraded",
-                message=f"External dependency check failed: {str(e)}",
-                details={"error": str(e)}
-            )
-
-    def _generate_summary(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate a summary of health check results"""
-        total_checks = len(results)
-        healthy_count = sum(1 for r in results.values() if r["status"] == "healthy")
-        degraded_count = sum(1 for r in results.values() if r["status"] == "degraded")
-        unhealthy_count = sum(1 for r in results.values() if r["status"] == "unhealthy")
-        unknown_count = sum(1 for r in results.values() if r["status"] == "unknown")
+    def _generate_summary(self, counts: Dict[str, int], total_checks: int) -> Dict[str, Any]:
+        """Generate a summary of health check results from per-status counts"""
+        healthy_count = counts["healthy"]
 
         return {
             "total_checks": total_checks,
             "healthy": healthy_count,
-            "degraded": degraded_count,
-            "unhealthy": unhealthy_count,
-            "unknown": unknown_count,
+            "degraded": counts["degraded"],
+            "unhealthy": counts["unhealthy"],
+            "unknown": counts["unknown"],
             "health_score": round((healthy_count / total_checks) * 100, 1) if total_checks > 0 else 0
         }
 
     async def check_component(self, component_name: str) -> Dict[str, Any]:
         """Run health check for a specific component"""
+        static_check = self.static_checks.get(component_name)
+        if static_check is not None:
+            return {**static_check.to_dict(), "timestamp": _now_iso()}
+
         if component_name not in self.checks:
             return {
                 "error": f"Unknown component: {component_name}",
-                "available_components": list(self.checks.keys())
+                "available_components": [*self.checks, *self.static_checks]
             }
 
         check_func = self.checks[component_name]
-        result = await self._run_check(component_name, check_func)
+        result = await self._run_check(component_name, check_func, include_details=True)
         return result.to_dict()
 
 
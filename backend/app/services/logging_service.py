@@ -1,24 +1,378 @@
-import json
+import atexit
+import copy
+import csv
+import itertools
 import logging
+import os
+import queue
+import re
+import stat
 import sys
-from datetime import datetime, timedelta
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Iterator, Optional, List, Sequence, Tuple, Union
+import msgpack
+import orjson
 import structlog
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from pythonjsonlogger import jsonlogger
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 
 from app.core.config import settings
 
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Records waiting for the writer thread; past this, new records are dropped rather than blocking callers
+LOG_QUEUE_SIZE = 100_000
+# Log files are written through a buffer of this size and flushed at least this often (seconds)
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.2
+
+# Log file behind each logger type accepted by the log management methods
+LOG_FILES = {
+    "app": "application.log",
+    "access": "access.log",
+    "security": "security.log",
+    "database": "database.log",
+    "aws": "aws_api.log",
+    "jobs": "jobs.log",
+    "errors": "errors.log"
+}
+STATS_LEVELS = ("INFO", "WARNING", "ERROR", "DEBUG")
+EXPORT_CSV_FIELDS = ("timestamp", "levelname", "name", "message", "extra")
+
+# Access log sampling for high-QPS endpoints: only every Nth successful request is logged.
+# Errors (status >= 400) are always logged; endpoints not listed here are logged in full.
+ACCESS_LOG_SAMPLE_RATES = {
+    "/health": 100,
+    "/metrics": 10,
+}
+_ACCESS_SAMPLER: Dict[str, Tuple[Iterator[int], int]] = {
+    endpoint: (itertools.count(), sample_every)
+    for endpoint, sample_every in ACCESS_LOG_SAMPLE_RATES.items()
+}
+
+# Field extractors for get_log_stats, which only needs two fields and skips parsing the whole line
+_LEVELNAME_RE = re.compile(rb'"levelname":\s*"([^"]*)"')
+_TIMESTAMP_RE = re.compile(rb'"timestamp":\s*"([^"]*)"')
+_ASCTIME_RE = re.compile(rb'"asctime":\s*"([^"]*)"')
+
+# Attributes every LogRecord carries; anything else on a record came in through `extra`
+_RESERVED_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """Render log records as one JSON object per line using orjson"""
+
+    def __init__(self, fields: Sequence[str] = ("message",), datefmt: Optional[str] = None):
+        super().__init__(datefmt=datefmt)
+        self.fields = tuple(fields)
+        self.uses_time = "asctime" in self.fields
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        if self.uses_time:
+            record.asctime = self.formatTime(record, self.datefmt)
+
+        log_entry = {field: getattr(record, field, None) for field in self.fields}
+        # Derived from the record's own creation time, so callers don't stamp entries themselves
+        log_entry["timestamp"] = datetime.utcfromtimestamp(record.created).isoformat()
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                log_entry[key] = value
+
+        if record.exc_info:
+            log_entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            log_entry["stack_info"] = self.formatStack(record.stack_info)
+
+        return orjson.dumps(log_entry, default=str, option=ORJSON_OPTIONS).decode()
+
+
+def _archive_name(default_name: str) -> str:
+    return f"{default_name}.mpack"
+
+
+def _archive_rotator(source: str, dest: str):
+    """Rotate a log file into a msgpack archive: one packed object per entry, no line framing"""
+    packer = msgpack.Packer()
+    with open(source, 'rb') as src, open(dest, 'wb') as out:
+        for line in src:
+            line = line.rstrip(b'\r\n')
+            if not line:
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Plain-text logs (access.log) are archived line by line as strings
+                entry = line.decode('utf-8', 'replace')
+            out.write(packer.pack(entry))
+    os.remove(source)
+
+
+def read_log_archive(path: Path) -> Iterator[Any]:
+    """Yield the entries of a msgpack log archive written on rotation"""
+    with open(path, 'rb') as f:
+        yield from msgpack.Unpacker(f, raw=False)
+
+
+def _tail(path: Path, n: int, block_size: int = 64 * 1024) -> List[bytes]:
+    """Return the last n lines of a file, reading backwards from the end in fixed-size blocks"""
+    if n <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # n + 1 newlines guarantee n complete lines even when the file ends with a newline
+        while pos > 0 and newlines <= n:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    return b''.join(reversed(chunks)).splitlines()[-n:]
+
+
+def _line_matcher(terms: Union[str, Sequence[str], None]) -> Optional[Callable[[bytes], bool]]:
+    """Build a case-insensitive test for raw log lines that contain any of the terms"""
+    if isinstance(terms, str):
+        terms = (terms,)
+    # An empty term matches every line, so there is nothing to filter
+    if not terms or not all(terms):
+        return None
+
+    # One compiled alternation scans each line once however many terms there are
+    if all(term.isascii() for term in terms):
+        pattern = re.compile(b"|".join(re.escape(term.encode()) for term in terms), re.IGNORECASE)
+        return lambda line: pattern.search(line) is not None
+
+    # Non-ASCII terms need Unicode case folding, so match on the decoded line
+    pattern = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+    return lambda line: pattern.search(line.decode('utf-8', 'replace')) is not None
+
+
+def _time_key(value: Any) -> Optional[str]:
+    """Normalise a logged timestamp (ISO or asctime) to a string that sorts chronologically"""
+    if not isinstance(value, str) or len(value) < 19 or value[4] != '-' or value[7] != '-':
+        return None
+    if value[10] != 'T':
+        value = f"{value[:10]}T{value[11:]}"
+    if value[-1] == 'Z':
+        value = value[:-1]
+    return value
+
+
+def _time_bound(value: Optional[datetime]) -> Optional[str]:
+    """Render a filter bound in the same naive-UTC ISO form as the logged timestamps"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+class _RoutedQueueHandler(QueueHandler):
+    """Hand records to the shared writer thread, tagged with the handlers of the logger they belong to"""
+
+    def __init__(self, log_queue: queue.Queue, handlers: Sequence[logging.Handler]):
+        super().__init__(log_queue)
+        self.route = tuple(handlers)
+
+    def handle(self, record: logging.LogRecord):
+        # The queue is already thread-safe, so skip the per-handler lock Handler.handle would take
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args now since they may be mutated later; formatting itself stays on the writer thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait((self.route, record))
+        except queue.Full:
+            pass
+
+
+# Processors shared by every structlog configuration; the renderer is appended per environment
+STRUCTLOG_PROCESSORS = (
+    structlog.stdlib.filter_by_level,
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+)
+
+_structlog_configured = False
+
+
+def _orjson_render(_, __, event_dict: Dict[str, Any]) -> str:
+    """structlog renderer: serialize the event dict with orjson"""
+    return orjson.dumps(event_dict, default=str, option=ORJSON_OPTIONS).decode()
+
+
+def configure_structlog():
+    """Configure structlog for structured logging; later calls are no-ops"""
+    global _structlog_configured
+    if _structlog_configured:
+        return
+
+    # Add JSON renderer for production, console for development
+    if settings.ENVIRONMENT == "development":
+        renderer = structlog.dev.ConsoleRenderer()
+    else:
+        renderer = _orjson_render
+
+    structlog.configure(
+        processors=[*STRUCTLOG_PROCESSORS, renderer],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    _structlog_configured = True
+
+
+class _EventLog:
+    """One log_* event: a fixed message on a fixed logger, with the logger's methods looked up once"""
+
+    __slots__ = ("enabled", "_log", "_message")
+
+    def __init__(self, logger: logging.Logger, message: str):
+        self.enabled = logger.isEnabledFor
+        self._log = logger.log
+        self._message = message
+
+    def __call__(self, level: int, log_data: Dict[str, Any], **kwargs):
+        # stacklevel=2 attributes the record (funcName/lineno) to the log_* helper, not to this wrapper
+        self._log(level, self._message, extra=log_data, stacklevel=2, **kwargs)
+
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that buffers writes, flushing on warnings and at most LOG_FLUSH_INTERVAL apart"""
+
+    def __init__(self, *args, **kwargs):
+        self._size = 0
+        self._regular_file = True
+        self._pending = False
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+        # Track the size ourselves so rollover checks don't have to seek (and flush) per record
+        file_stat = os.fstat(stream.fileno())
+        self._size = file_stat.st_size
+        self._regular_file = stat.S_ISREG(file_stat.st_mode)
+        return stream
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._regular_file and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += len(msg)
+
+            if record.levelno >= logging.WARNING or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL:
+                self.flush()
+            else:
+                self._pending = True
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        super().flush()
+        self._pending = False
+        self._last_flush = time.monotonic()
+
+    def flush_pending(self):
+        """Flush buffered records, if there are any"""
+        if self._pending:
+            self.flush()
+
+
+class _RoutedQueueListener(QueueListener):
+    """Writer thread that passes each record only to the handlers it was routed to"""
+
+    def stop(self):
+        # Safe to call more than once (explicit shutdown, then atexit)
+        if self._thread is not None:
+            super().stop()
+            self._flush_handlers()
+
+    def dequeue(self, block: bool):
+        # Wake up while idle so buffered records reach disk within LOG_FLUSH_INTERVAL
+        while True:
+            try:
+                return self.queue.get(block, timeout=LOG_FLUSH_INTERVAL if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                self._flush_handlers()
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            handler.flush_pending()
+
+    def handle(self, item):
+        route, record = item
+        for handler in route:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
 
 class LoggingService:
     """Enhanced logging service with structured logging, audit trails, and log management"""
 
+    _instance: Optional["LoggingService"] = None
+
+    def __new__(cls):
+        # One set of handlers and one writer thread per process, however often this is constructed
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
+        self._log_paths = {logger_type: self.log_dir / filename for logger_type, filename in LOG_FILES.items()}
+        # Loggers only enqueue; one listener thread does the formatting and file I/O
+        self._log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._file_handlers: List[_BufferedRotatingFileHandler] = []
         self._setup_loggers()
-        self._configure_structlog()
+        self._bind_event_logs()
+        self._listener = _RoutedQueueListener(self._log_queue, *self._file_handlers)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+        configure_structlog()
 
     def _setup_loggers(self):
         """Set up various loggers for different purposes"""
@@ -76,6 +430,17 @@ class LoggingService:
             backup_count=10
         )
 
+    def _bind_event_logs(self):
+        """Bind each log_* helper's logger and message"""
+        self._api_access_log = _EventLog(self.access_logger, "API Access")
+        self._security_event_log = _EventLog(self.security_logger, "Security Event")
+        self._auth_event_log = _EventLog(self.security_logger, "Authentication Event")
+        self._aws_api_call_log = _EventLog(self.aws_logger, "AWS API Call")
+        self._database_operation_log = _EventLog(self.db_logger, "Database Operation")
+        self._job_event_log = _EventLog(self.job_logger, "Job Event")
+        self._business_event_log = _EventLog(self.app_logger, "Business Event")
+        self._error_log = _EventLog(self.error_logger, "Application Error")
+
     def _create_logger(
         self,
         name: str,
@@ -96,24 +461,29 @@ class LoggingService:
 
         # File handler with rotation
         file_path = self.log_dir / filename
-        file_handler = RotatingFileHandler(
+        file_handler = _BufferedRotatingFileHandler(
             filename=file_path,
             maxBytes=max_bytes,
             backupCount=backup_count,
             encoding='utf-8'
         )
         file_handler.setLevel(level)
+        if settings.LOG_ARCHIVE_MSGPACK:
+            # Backups become application.log.1.mpack, ...; the live file stays JSON lines
+            file_handler.namer = _archive_name
+            file_handler.rotator = _archive_rotator
+        handlers: List[logging.Handler] = []
 
         # Console handler for development
         if settings.DEBUG:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(level)
-            logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
         # Set formatter
         if formatter_type == "json":
-            formatter = jsonlogger.JsonFormatter(
-                fmt='%(asctime)s %(name)s %(levelname)s %(message)s',
+            formatter = OrjsonFormatter(
+                fields=("asctime", "name", "levelname", "message"),
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
         elif formatter_type == "access":
@@ -122,46 +492,20 @@ class LoggingService:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
         elif formatter_type == "security":
-            formatter = jsonlogger.JsonFormatter(
-                fmt='%(asctime)s %(name)s %(levelname)s %(funcName)s %(lineno)d %(message)s',
+            formatter = OrjsonFormatter(
+                fields=("asctime", "name", "levelname", "funcName", "lineno", "message"),
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
         else:
-            formatter = jsonlogger.JsonFormatter()
+            formatter = OrjsonFormatter()
 
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+        self._file_handlers.append(file_handler)
+        logger.addHandler(_RoutedQueueHandler(self._log_queue, handlers))
 
         return logger
 
-    def _configure_structlog(self):
-        """Configure structlog for structured logging"""
-
-        processors = [
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-        ]
-
-        # Add JSON renderer for production, console for development
-        if settings.ENVIRONMENT == "development":
-            processors.append(structlog.dev.ConsoleRenderer())
-        else:
-            processors.append(structlog.processors.JSONRenderer())
-
-        structlog.configure(
-            processors=processors,
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
-
     # Specialized logging methods
 
     def log_api_access(
@@ -175,17 +519,25 @@ class LoggingService:
         request_id: Optional[str] = None
     ):
         """Log API access"""
-        self.access_logger.info(
-            "API Access",
-            extra={
+        if not self._api_access_log.enabled(logging.INFO):
+            return
+
+        sampler = _ACCESS_SAMPLER.get(endpoint)
+        if sampler is not None and status_code < 400:
+            counter, sample_every = sampler
+            if next(counter) % sample_every:
+                return
+
+        self._api_access_log(
+            logging.INFO,
+            {
                 "method": method,
                 "endpoint": endpoint,
                 "status_code": status_code,
                 "duration_ms": round(duration * 1000, 2),
                 "user_id": user_id,
                 "client_ip": client_ip,
-                "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "request_id": request_id
             }
         )
 
@@ -198,21 +550,20 @@ class LoggingService:
         additional_data: Optional[Dict[str, Any]] = None
     ):
         """Log security-related events"""
+        if not self._security_event_log.enabled(logging.WARNING):
+            return
+
         log_data = {
             "event_type": event_type,
             "description": description,
             "user_id": user_id,
-            "client_ip": client_ip,
-            "timestamp": datetime.utcnow().isoformat()
+            "client_ip": client_ip
         }
 
         if additional_data:
             log_data.update(additional_data)
 
-        self.security_logger.warning(
-            "Security Event",
-            extra=log_data
-        )
+        self._security_event_log(logging.WARNING, log_data)
 
     def log_auth_event(
         self,
@@ -224,24 +575,22 @@ class LoggingService:
         failure_reason: Optional[str] = None
     ):
         """Log authentication events"""
+        level = logging.INFO if success else logging.WARNING
+        if not self._auth_event_log.enabled(level):
+            return
+
         log_data = {
             "event": event,
             "user_email": user_email,
             "success": success,
             "client_ip": client_ip,
-            "user_agent": user_agent,
-            "timestamp": datetime.utcnow().isoformat()
+            "user_agent": user_agent
         }
 
         if not success and failure_reason:
             log_data["failure_reason"] = failure_reason
 
-        level = logging.INFO if success else logging.WARNING
-        self.security_logger.log(
-            level,
-            "Authentication Event",
-            extra=log_data
-        )
+        self._auth_event_log(level, log_data)
 
     def log_aws_api_call(
         self,
@@ -254,25 +603,23 @@ class LoggingService:
         request_id: Optional[str] = None
     ):
         """Log AWS API calls"""
+        level = logging.INFO if success else logging.ERROR
+        if not self._aws_api_call_log.enabled(level):
+            return
+
         log_data = {
             "service": service,
             "operation": operation,
             "duration_ms": round(duration * 1000, 2),
             "success": success,
             "account_id": account_id,
-            "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "request_id": request_id
         }
 
         if not success and error_message:
             log_data["error_message"] = error_message
 
-        level = logging.INFO if success else logging.ERROR
-        self.aws_logger.log(
-            level,
-            "AWS API Call",
-            extra=log_data
-        )
+        self._aws_api_call_log(level, log_data)
 
     def log_database_operation(
         self,
@@ -283,25 +630,21 @@ class LoggingService:
         error_message: Optional[str] = None
     ):
         """Log database operations"""
+        level = logging.ERROR if error_message else logging.INFO
+        if not self._database_operation_log.enabled(level):
+            return
+
         log_data = {
             "operation": operation,
             "table": table,
             "duration_ms": round(duration * 1000, 2),
-            "rows_affected": rows_affected,
-            "timestamp": datetime.utcnow().isoformat()
+            "rows_affected": rows_affected
         }
 
         if error_message:
             log_data["error_message"] = error_message
-            level = logging.ERROR
-        else:
-            level = logging.INFO
 
-        self.db_logger.log(
-            level,
-            "Database Operation",
-            extra=log_data
-        )
+        self._database_operation_log(level, log_data)
 
     def log_job_event(
         self,
@@ -314,12 +657,15 @@ class LoggingService:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """Log background job events"""
+        level = logging.ERROR if status == "failed" else logging.INFO
+        if not self._job_event_log.enabled(level):
+            return
+
         log_data = {
             "job_id": job_id,
             "job_type": job_type,
             "event": event,
-            "status": status,
-            "timestamp": datetime.utcnow().isoformat()
+            "status": status
         }
 
         if duration is not None:
@@ -331,12 +677,7 @@ class LoggingService:
         if metadata:
             log_data.update(metadata)
 
-        level = logging.ERROR if status == "failed" else logging.INFO
-        self.job_logger.log(
-            level,
-            "Job Event",
-            extra=log_data
-        )
+        self._job_event_log(level, log_data)
 
     def log_business_event(
         self,
@@ -348,22 +689,21 @@ class LoggingService:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """Log business-related events"""
+        if not self._business_event_log.enabled(logging.INFO):
+            return
+
         log_data = {
             "event_type": event_type,
             "description": description,
             "user_id": user_id,
             "account_id": account_id,
-            "amount": amount,
-            "timestamp": datetime.utcnow().isoformat()
+            "amount": amount
         }
 
         if metadata:
             log_data.update(metadata)
 
-        self.app_logger.info(
-            "Business Event",
-            extra=log_data
-        )
+        self._business_event_log(logging.INFO, log_data)
 
     def log_error(
         self,
@@ -373,25 +713,71 @@ class LoggingService:
         request_id: Optional[str] = None
     ):
         """Log application errors"""
+        if not self._error_log.enabled(logging.ERROR):
+            return
+
         log_data = {
             "error_type": type(error).__name__,
             "error_message": str(error),
             "user_id": user_id,
-            "request_id": request_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "request_id": request_id
         }
 
         if context:
             log_data.update(context)
 
-        self.error_logger.error(
-            "Application Error",
-            extra=log_data,
-            exc_info=True
-        )
+        self._error_log(logging.ERROR, log_data, exc_info=True)
 
     # Log management methods
 
+    def _iter_log_records(
+        self,
+        logger_name: str,
+        lines: int,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        contains: Union[str, Sequence[str], None] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield parsed entries from the last `lines` lines of a log, optionally within a time window
+        and limited to lines containing `contains` (or any of several terms, case-insensitive)"""
+        log_file = self._log_paths.get(logger_name) or self._log_paths["app"]
+        if not log_file.exists():
+            return
+
+        # ISO timestamps sort lexically, so the window is checked with string comparisons
+        start_key = _time_bound(start_time)
+        end_key = _time_bound(end_time)
+        filter_time = start_key is not None or end_key is not None
+        matches = _line_matcher(contains)
+        loads = orjson.loads
+        decode_error = orjson.JSONDecodeError
+
+        for line in _tail(log_file, lines):
+            # Match on the raw line first so non-matching lines are never parsed
+            if matches is not None and not matches(line):
+                continue
+
+            try:
+                log_entry = loads(line)
+            except decode_error:
+                # Handle non-JSON log lines
+                log_entry = {
+                    'message': line.decode('utf-8', 'replace').strip(),
+                    'timestamp': datetime.utcnow().isoformat(),
+                    'levelname': 'INFO'
+                }
+
+            if filter_time:
+                log_time = _time_key(log_entry.get('timestamp', log_entry.get('asctime')))
+                if log_time is None:
+                    continue
+                if start_key and log_time < start_key:
+                    continue
+                if end_key and log_time > end_key:
+                    continue
+
+            yield log_entry
+
     def get_recent_logs(
         self,
         logger_name: str = "aws_cost_sentinel",
@@ -402,43 +788,16 @@ class LoggingService:
         log_entries = []
 
         try:
-            logger_mapping = {
-                "app": "application.log",
-                "access": "access.log",
-                "security": "security.log",
-                "database": "database.log",
-                "aws": "aws_api.log",
-                "jobs": "jobs.log",
-                "errors": "errors.log"
-            }
-
-            filename = logger_mapping.get(logger_name, "application.log")
-            log_file = self.log_dir / filename
-
-            if not log_file.exists():
-                return log_entries
-
-            # Read last N lines
-            with open(log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-
-            for line in recent_lines:
-                try:
-                    log_entry = json.loads(line.strip())
-
-                    # Filter by level if specified
-                    if level and log_entry.get('levelname', '').lower() != level.lower():
-                        continue
-
-                    log_entries.append(log_entry)
-                except json.JSONDecodeError:
-                    # Handle non-JSON log lines
-                    log_entries.append({
-                        'message': line.strip(),
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'levelname': 'INFO'
-                    })
+            records = self._iter_log_records(logger_name, lines)
+            if level:
+                # Filter by level if specified
+                level = level.lower()
+                log_entries = [
+                    log_entry for log_entry in records
+                    if log_entry.get('levelname', '').lower() == level
+                ]
+            else:
+                log_entries = list(records)
 
         except Exception as e:
             self.log_error(e, context={"operation": "get_recent_logs"})
@@ -447,36 +806,21 @@ class LoggingService:
 
     def search_logs(
         self,
-        query: str,
+        query: Union[str, Sequence[str]],
         logger_name: str = "app",
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """Search logs with filters"""
+        """Search logs with filters; a list of terms matches entries containing any of them"""
         results = []
 
         try:
-            logs = self.get_recent_logs(logger_name, lines=10000)  # Get more for searching
-
-            for log_entry in logs:
-                # Time filter
-                if start_time or end_time:
-                    log_time_str = log_entry.get('timestamp', log_entry.get('asctime', ''))
-                    try:
-                        log_time = datetime.fromisoformat(log_time_str.replace('Z', '+00:00'))
-
-                        if start_time and log_time < start_time:
-                            continue
-                        if end_time and log_time > end_time:
-                            continue
-                    except (ValueError, TypeError):
-                        continue
-
-                # Text search
-                log_text = json.dumps(log_entry).lower()
-                if query.lower() in log_text:
-                    results.append(log_entry)
+            # Search a wider window than get_recent_logs' default
+            for log_entry in self._iter_log_records(
+                logger_name, 10000, start_time, end_time, contains=query
+            ):
+                results.append(log_entry)
 
                 if len(results) >= limit:
                     break
@@ -490,46 +834,51 @@ class LoggingService:
         """Get logging statistics"""
         stats = {
             "total_entries": 0,
-            "by_level": {"INFO": 0, "WARNING": 0, "ERROR": 0, "DEBUG": 0},
+            "by_level": dict.fromkeys(STATS_LEVELS, 0),
             "by_logger": {},
             "error_rate": 0.0,
             "top_errors": []
         }
 
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-
-            # Aggregate stats from all log files
-            for logger_type in ["app", "access", "security", "database", "aws", "jobs", "errors"]:
-                logs = self.get_recent_logs(logger_type, lines=10000)
-
-                logger_stats = {"total": 0, "errors": 0}
-
-                for log_entry in logs:
-                    # Time filter
-                    log_time_str = log_entry.get('timestamp', log_entry.get('asctime', ''))
-                    try:
-                        log_time = datetime.fromisoformat(log_time_str.replace('Z', '+00:00'))
-                        if log_time < cutoff_time:
-                            continue
-                    except (ValueError, TypeError):
-                        continue
-
-                    stats["total_entries"] += 1
-                    logger_stats["total"] += 1
-
-                    level = log_entry.get('levelname', 'INFO')
-                    stats["by_level"][level] = stats["by_level"].get(level, 0) + 1
-
-                    if level == "ERROR":
-                        logger_stats["errors"] += 1
-
-                stats["by_logger"][logger_type] = logger_stats
+            cutoff = _time_bound(datetime.utcnow() - timedelta(hours=hours))
+            by_level = Counter(stats["by_level"])
+            by_logger = stats["by_logger"]
+            timestamp_search = _TIMESTAMP_RE.search
+            asctime_search = _ASCTIME_RE.search
+            levelname_search = _LEVELNAME_RE.search
+
+            # Aggregate stats from all log files in one pass over each tail
+            for logger_type, log_file in self._log_paths.items():
+                total = errors = 0
+
+                if log_file.exists():
+                    for line in _tail(log_file, 10000):
+                        if line[:1] == b'{':
+                            match = timestamp_search(line) or asctime_search(line)
+                            log_time = _time_key(match.group(1).decode()) if match else None
+                            if log_time is None or log_time < cutoff:
+                                continue
+                            match = levelname_search(line)
+                            level = match.group(1).decode() if match else "INFO"
+                        else:
+                            # Non-JSON lines are reported as INFO entries read just now
+                            level = "INFO"
+
+                        by_level[level] += 1
+                        total += 1
+                        if level == "ERROR":
+                            errors += 1
+
+                by_logger[logger_type] = {"total": total, "errors": errors}
+
+            stats["by_level"] = dict(by_level)
 
             # Calculate error rate
-            total_entries = stats["total_entries"]
+            total_entries = sum(by_level.values())
+            stats["total_entries"] = total_entries
             if total_entries > 0:
-                stats["error_rate"] = (stats["by_level"]["ERROR"] / total_entries) * 100
+                stats["error_rate"] = (by_level["ERROR"] / total_entries) * 100
 
         except Exception as e:
             self.log_error(e, context={"operation": "get_log_stats"})
@@ -541,19 +890,22 @@ class LoggingService:
         cleaned_count = 0
 
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+            cutoff_ts = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
 
-            for log_file in self.log_dir.glob("*.log.*"):  # Rotated log files
-                if log_file.stat().st_mtime < cutoff_date.timestamp():
-                    log_file.unlink()
-                    cleaned_count += 1
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    # Rotated log files (application.log.1, ...); is_file() uses the cached dirent type
+                    if '.log.' not in entry.name or not entry.is_file(follow_symlinks=False):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
+                        cleaned_count += 1
 
             self.app_logger.info(
                 "Log cleanup completed",
                 extra={
                     "files_removed": cleaned_count,
-                    "days_kept": days_to_keep,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "days_kept": days_to_keep
                 }
             )
 
@@ -571,38 +923,45 @@ class LoggingService:
     ) -> str:
         """Export logs to file"""
         try:
-            logs = self.get_recent_logs(logger_name, lines=50000)
-
-            # Filter by time if specified
-            if start_time or end_time:
-                filtered_logs = []
-                for log_entry in logs:
-                    log_time_str = log_entry.get('timestamp', log_entry.get('asctime', ''))
-                    try:
-                        log_time = datetime.fromisoformat(log_time_str.replace('Z', '+00:00'))
-
-                        if start_time and log_time < start_time:
-                            continue
-                        if end_time and log_time > end_time:
-                            continue
-
-                        filtered_logs.append(log_entry)
-                    except (ValueError, TypeError):
-                        continue
-
-                logs = filtered_logs
+            logs = self._iter_log_records(logger_name, 50000, start_time, end_time)
 
             # Create export file
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             export_filename = f"logs_export_{logger_name}_{timestamp}.{format_type}"
             export_path = self.log_dir / export_filename
 
-            with open(export_path, 'w', encoding='utf-8') as f:
-                if format_type == "json":
-                    json.dump(logs, f, indent=2, default=str)
-                else:  # CSV or plain text
+            # Entries are written as they are read, so the export never holds the whole set in memory
+            if format_type == "json":
+                # A JSON array, one entry per line
+                with open(export_path, 'wb') as f:
+                    f.write(b"[")
+                    separator = b"\n"
+                    for log_entry in logs:
+                        f.write(separator)
+                        f.write(orjson.dumps(log_entry, default=str, option=ORJSON_OPTIONS))
+                        separator = b",\n"
+                    f.write(b"\n]\n")
+            elif format_type == "csv":
+                with open(export_path, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=EXPORT_CSV_FIELDS)
+                    writer.writeheader()
+                    for log_entry in logs:
+                        log_entry = dict(log_entry)
+                        row = {
+                            "timestamp": log_entry.pop('timestamp', None) or log_entry.pop('asctime', None),
+                            "levelname": log_entry.pop('levelname', None),
+                            "name": log_entry.pop('name', None),
+                            "message": log_entry.pop('message', None)
+                        }
+                        log_entry.pop('asctime', None)
+                        # Fields that vary per record go into one JSON column
+                        row["extra"] = orjson.dumps(log_entry, default=str, option=ORJSON_OPTIONS).decode()
+                        writer.writerow(row)
+            else:  # Plain text: newline-delimited JSON
+                with open(export_path, 'wb') as f:
                     for log_entry in logs:
-                        f.write(f"{log_entry}\n")
+                        f.write(orjson.dumps(log_entry, default=str, option=ORJSON_OPTIONS))
+                        f.write(b"\n")
 
             return str(export_path)
 
@@ -1,6 +1,9 @@
 import time
 import asyncio
-from typing import Dict, Any, Optional, List
+import gzip
+import sys
+import threading
+from typing import Dict, Any, Iterable, Optional, List
 from functools import wraps
 import psutil
 import structlog
@@ -20,17 +23,82 @@ from prometheus_client import (
 )
 from fastapi import Response
 
+from app.core.config import settings
+
 logger = structlog.get_logger(__name__)
 
+# Status code label values, so the HTTP hot path doesn't format an int on every request
+_STATUS_STR = {code: str(code) for code in range(100, 600)}
+
+# Endpoint label for paths that don't belong to a registered route, so scanners can't mint new series
+OTHER_ENDPOINT = "__other__"
+
+# Histogram bucket bounds (seconds). prometheus_client only exposes classic histograms, so every
+# bound is a series per label set; keep these short and centered on each metric's real range.
+HTTP_DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+DB_QUERY_DURATION_BUCKETS = (0.001, 0.005, 0.02, 0.1, 0.5)
+QUEUE_JOB_DURATION_BUCKETS = (1.0, 10.0, 60.0, 600.0)
+AWS_API_DURATION_BUCKETS = (0.1, 0.5, 2.0, 10.0)
+REPORT_DURATION_BUCKETS = (1.0, 10.0, 60.0, 300.0)
+
+
+def _cpu_busy_percent(before, after) -> float:
+    """System-wide CPU utilization between two psutil.cpu_times() readings"""
+    def total(times):
+        # On Linux guest time is already counted in user time
+        return sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+
+    def idle(times):
+        return times.idle + getattr(times, 'iowait', 0)
+
+    all_delta = total(after) - total(before)
+    if all_delta <= 0:
+        return 0.0
+    busy_delta = all_delta - (idle(after) - idle(before))
+    return round(min(max(busy_delta / all_delta * 100, 0.0), 100.0), 1)
+
 
 class MetricsService:
     """Comprehensive metrics collection service using Prometheus"""
 
+    # Seconds between merges of buffered events into the Prometheus metrics
+    FLUSH_INTERVAL = 1.0
+    # Seconds a psutil sample is reused before the system metrics are sampled again
+    SYSTEM_SAMPLE_TTL = 5.0
+    # Seconds between background renders of the exposition, and the age past which a scrape renders itself
+    RENDER_INTERVAL = 5.0
+    RENDER_MAX_AGE = 30.0
+    # Seconds over which distinct users are counted for user_actions_unique_users
+    UNIQUE_USERS_WINDOW = 300.0
+
     def __init__(self):
         self.registry = REGISTRY
         self._setup_metrics()
         self._setup_system_metrics()
         self._business_metrics = defaultdict(float)
+        # Labeled children keyed on (metric tag, *label values)
+        self._label_cache: Dict[tuple, Any] = {}
+        # Route templates accepted as endpoint labels; set once the app's routes are known
+        self._known_routes: frozenset = frozenset()
+        # Events buffered per labeled child until the next flush
+        self._pending_counts: Dict[Any, float] = defaultdict(float)
+        self._pending_obs: Dict[Any, List[float]] = defaultdict(list)
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        # Last rendered exposition, served as-is by export_metrics
+        self._rendered: bytes = b""
+        self._rendered_gzip: bytes = b""
+        self._rendered_ts = 0.0
+        self._renderer: Optional[asyncio.Task] = None
+        # Users seen per action in the current unique-users window
+        self._action_users: Dict[str, set] = defaultdict(set)
+        self._action_users_since = time.monotonic()
+        self._known_actions: set = set()
+        # Latest psutil readings and when they were taken (monotonic)
+        self._psutil_cache: Dict[str, Any] = {"ts": 0.0, "cpu": 0.0, "mem": None, "disk": None}
+        # CPU utilization is derived from our own cpu_times() baseline; psutil.cpu_percent's baseline
+        # is shared per thread with the health service's sampler, which would reset it under us
+        self._cpu_times = psutil.cpu_times()
 
     def _setup_metrics(self):
         """Initialize Prometheus metrics"""
@@ -47,7 +115,7 @@ class MetricsService:
             'http_request_duration_seconds',
             'HTTP request latency',
             ['method', 'endpoint'],
-            buckets=[0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0],
+            buckets=HTTP_DURATION_BUCKETS,
             registry=self.registry
         )
 
@@ -56,7 +124,7 @@ class MetricsService:
             'db_query_duration_seconds',
             'Database query execution time',
             ['query_type', 'table'],
-            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+            buckets=DB_QUERY_DURATION_BUCKETS,
             registry=self.registry
         )
 
@@ -104,7 +172,7 @@ class MetricsService:
             'queue_job_duration_seconds',
             'Job processing duration',
             ['queue_name', 'job_type'],
-            buckets=[0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0, 1800.0],
+            buckets=QUEUE_JOB_DURATION_BUCKETS,
             registry=self.registry
         )
 
@@ -127,7 +195,7 @@ class MetricsService:
             'aws_api_duration_seconds',
             'AWS API call duration',
             ['service', 'operation'],
-            buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
+            buckets=AWS_API_DURATION_BUCKETS,
             registry=self.registry
         )
 
@@ -184,7 +252,14 @@ class MetricsService:
         self.user_actions_total = Counter(
             'user_actions_total',
             'Total user actions',
-            ['action', 'user_id'],
+            ['action'],
+            registry=self.registry
+        )
+
+        self.user_actions_unique_users = Gauge(
+            'user_actions_unique_users',
+            'Distinct users performing each action in the last complete window',
+            ['action'],
             registry=self.registry
         )
 
@@ -214,7 +289,7 @@ class MetricsService:
             'report_generation_duration_seconds',
             'Report generation duration',
             ['format'],
-            buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+            buckets=REPORT_DURATION_BUCKETS,
             registry=self.registry
         )
 
@@ -226,6 +301,27 @@ class MetricsService:
             registry=self.registry
         )
 
+        # Health Check Metrics
+        self.health_check_status = Gauge(
+            'health_check_status',
+            'Health check state (1 for the current status, 0 otherwise)',
+            ['check', 'status'],
+            registry=self.registry
+        )
+
+        self.metrics_snapshot_timestamp_seconds = Gauge(
+            'metrics_snapshot_timestamp_seconds',
+            'Unix time at which the served metrics snapshot was rendered',
+            registry=self.registry
+        )
+
+        self.health_check_duration_seconds = Gauge(
+            'health_check_duration_seconds',
+            'Duration of the latest health check probe',
+            ['check'],
+            registry=self.registry
+        )
+
     def _setup_system_metrics(self):
         """Initialize system-level metrics"""
 
@@ -254,12 +350,24 @@ class MetricsService:
             'Application information',
             registry=self.registry
         )
+        # Fixed for the process lifetime, so set once rather than on every update
+        self.application_info.info({
+            'version': settings.VERSION,
+            'environment': settings.ENVIRONMENT,
+            'python_version': f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+        })
 
     async def update_system_metrics(self):
         """Update system-level metrics"""
+        now = time.monotonic()
+        if now - self._psutil_cache["ts"] < self.SYSTEM_SAMPLE_TTL:
+            return
+
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU metrics (utilization since the previous sample, without blocking)
+            cpu_times = psutil.cpu_times()
+            cpu_percent = _cpu_busy_percent(self._cpu_times, cpu_times)
+            self._cpu_times = cpu_times
             self.system_cpu_percent.set(cpu_percent)
 
             # Memory metrics
@@ -274,45 +382,112 @@ class MetricsService:
             self.system_disk_bytes.labels(type='free').set(disk.free)
             self.system_disk_bytes.labels(type='used').set(disk.used)
 
-            # Application info
-            from app.core.config import settings
-            self.application_info.info({
-                'version': settings.VERSION,
-                'environment': settings.ENVIRONMENT,
-                'python_version': '3.11',  # You can get this dynamically
-            })
+            self._psutil_cache.update(ts=now, cpu=cpu_percent, mem=memory, disk=disk)
 
         except Exception as e:
             logger.error("Failed to update system metrics", error=str(e))
 
+    def _bind(self, metric, key: tuple):
+        """Return the child of metric for the label values in key[1:], resolving it only once"""
+        child = self._label_cache.get(key)
+        if child is None:
+            child = metric.labels(*key[1:])
+            self._label_cache[key] = child
+        return child
+
+    def set_known_routes(self, paths: Iterable[str]):
+        """Restrict HTTP endpoint labels to the given route templates"""
+        self._known_routes = frozenset(paths)
+
+    def _count(self, metric, key: tuple, amount: float = 1):
+        """Buffer an increment of the labeled child of metric"""
+        self._pending_counts[self._bind(metric, key)] += amount
+
+    def _observe(self, metric, key: tuple, value: float):
+        """Buffer an observation of the labeled child of metric"""
+        self._pending_obs[self._bind(metric, key)].append(value)
+
+    def flush(self):
+        """Merge buffered events into the Prometheus metrics"""
+        with self._flush_lock:
+            counts, self._pending_counts = self._pending_counts, defaultdict(float)
+            observations, self._pending_obs = self._pending_obs, defaultdict(list)
+
+        for child, amount in counts.items():
+            child.inc(amount)
+        for child, values in observations.items():
+            for value in values:
+                child.observe(value)
+
+    def start(self):
+        """Start the background tasks that flush buffered events and render the exposition"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        if self._renderer is None or self._renderer.done():
+            self._renderer = asyncio.create_task(self._render_loop())
+
+    async def stop(self):
+        """Stop the background tasks and write out anything still buffered"""
+        for task in (self._renderer, self._flusher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._renderer = None
+        self._flusher = None
+        self.flush()
+
+    def _render(self) -> bytes:
+        """Render the registry into the cached exposition"""
+        self.metrics_snapshot_timestamp_seconds.set(time.time())
+        data = generate_latest(self.registry)
+        # Compressed once per render so gzip scrapes don't each pay for it; level 1 is nearly as small on this text
+        self._rendered_gzip = gzip.compress(data, compresslevel=1)
+        self._rendered = data
+        self._rendered_ts = time.monotonic()
+        return data
+
+    async def _render_loop(self):
+        """Refresh system metrics and re-render the exposition every RENDER_INTERVAL seconds"""
+        while True:
+            try:
+                await self.update_system_metrics()
+                # Buffers are swapped on the loop thread; only the serialization runs off it
+                self.flush()
+                self._publish_unique_users()
+                await asyncio.to_thread(self._render)
+            except Exception as e:
+                logger.error("Failed to render metrics", error=str(e))
+            await asyncio.sleep(self.RENDER_INTERVAL)
+
+    async def _flush_loop(self):
+        """Flush buffered events every FLUSH_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Failed to flush metrics", error=str(e))
+
     # Metric recording methods
 
     def record_http_request(self, method: str, endpoint: str, status_code: int, duration: float):
         """Record HTTP request metrics"""
-        self.http_requests_total.labels(
-            method=method,
-            endpoint=endpoint,
-            status_code=str(status_code)
-        ).inc()
-
-        self.http_request_duration_seconds.labels(
-            method=method,
-            endpoint=endpoint
-        ).observe(duration)
+        if self._known_routes and endpoint not in self._known_routes:
+            endpoint = OTHER_ENDPOINT
+        status = _STATUS_STR.get(status_code) or str(status_code)
+        self._count(self.http_requests_total, ('http', method, endpoint, status))
+        self._observe(self.http_request_duration_seconds, ('httpd', method, endpoint), duration)
 
     def record_db_query(self, query_type: str, table: str, duration: float):
         """Record database query metrics"""
-        self.db_query_duration_seconds.labels(
-            query_type=query_type,
-            table=table
-        ).observe(duration)
+        self._observe(self.db_query_duration_seconds, ('dbd', query_type, table), duration)
 
     def record_cache_operation(self, operation: str, status: str):
         """Record cache operation metrics"""
-        self.cache_operations_total.labels(
-            operation=operation,
-            status=status
-        ).inc()
+        self._count(self.cache_operations_total, ('cache', operation, status))
 
     def update_cache_metrics(self, hit_ratio: float, size_bytes: int):
         """Update cache metrics"""
@@ -321,17 +496,10 @@ class MetricsService:
 
     def record_queue_job(self, queue_name: str, job_type: str, status: str, duration: float = None):
         """Record queue job metrics"""
-        self.queue_jobs_total.labels(
-            queue_name=queue_name,
-            job_type=job_type,
-            status=status
-        ).inc()
+        self._count(self.queue_jobs_total, ('queue', queue_name, job_type, status))
 
         if duration is not None:
-            self.queue_job_duration_seconds.labels(
-                queue_name=queue_name,
-                job_type=job_type
-            ).observe(duration)
+            self._observe(self.queue_job_duration_seconds, ('queued', queue_name, job_type), duration)
 
     def update_queue_size(self, queue_name: str, pending: int, running: int):
         """Update queue size metrics"""
@@ -340,16 +508,8 @@ class MetricsService:
 
     def record_aws_api_call(self, service: str, operation: str, status: str, duration: float):
         """Record AWS API call metrics"""
-        self.aws_api_calls_total.labels(
-            service=service,
-            operation=operation,
-            status=status
-        ).inc()
-
-        self.aws_api_duration_seconds.labels(
-            service=service,
-            operation=operation
-        ).observe(duration)
+        self._count(self.aws_api_calls_total, ('aws', service, operation, status))
+        self._observe(self.aws_api_duration_seconds, ('awsd', service, operation), duration)
 
     def record_aws_rate_limit_hit(self, service: str):
         """Record AWS API rate limit hit"""
@@ -361,17 +521,11 @@ class MetricsService:
 
     def record_waste_item_detected(self, category: str, account_id: str):
         """Record waste item detection"""
-        self.waste_items_detected_total.labels(
-            category=category,
-            account_id=account_id
-        ).inc()
+        self._count(self.waste_items_detected_total, ('waste', category, account_id))
 
     def record_recommendation_generated(self, recommendation_type: str, account_id: str):
         """Record recommendation generation"""
-        self.recommendations_generated_total.labels(
-            type=recommendation_type,
-            account_id=account_id
-        ).inc()
+        self._count(self.recommendations_generated_total, ('rec', recommendation_type, account_id))
 
     def update_potential_savings(self, account_id: str, amount: float):
         """Update potential savings metric"""
@@ -387,7 +541,21 @@ class MetricsService:
 
     def record_user_action(self, action: str, user_id: str):
         """Record user action"""
-        self.user_actions_total.labels(action=action, user_id=user_id).inc()
+        # Per-user detail goes to the log; a user_id label would add a series per user
+        self._count(self.user_actions_total, ('user', action))
+        self._action_users[action].add(user_id)
+        logger.info("User action", action=action, user_id=user_id)
+
+    def _publish_unique_users(self):
+        """Publish distinct users per action once the current window has elapsed"""
+        now = time.monotonic()
+        if now - self._action_users_since < self.UNIQUE_USERS_WINDOW:
+            return
+        action_users, self._action_users = self._action_users, defaultdict(set)
+        self._action_users_since = now
+        for action in self._known_actions | action_users.keys():
+            self.user_actions_unique_users.labels(action=action).set(len(action_users.get(action, ())))
+        self._known_actions |= action_users.keys()
 
     def update_websocket_connections(self, count: int):
         """Update WebSocket connections count"""
@@ -395,28 +563,23 @@ class MetricsService:
 
     def record_websocket_message(self, direction: str, message_type: str):
         """Record WebSocket message"""
-        self.websocket_messages_total.labels(
-            direction=direction,
-            message_type=message_type
-        ).inc()
+        self._count(self.websocket_messages_total, ('ws', direction, message_type))
 
     def record_report_generated(self, format_type: str, account_id: str, duration: float):
         """Record report generation"""
-        self.reports_generated_total.labels(
-            format=format_type,
-            account_id=account_id
-        ).inc()
-
-        self.report_generation_duration_seconds.labels(
-            format=format_type
-        ).observe(duration)
+        self._count(self.reports_generated_total, ('report', format_type, account_id))
+        self._observe(self.report_generation_duration_seconds, ('reportd', format_type), duration)
 
     def record_error(self, error_type: str, component: str):
         """Record error occurrence"""
-        self.errors_total.labels(
-            error_type=error_type,
-            component=component
-        ).inc()
+        self._count(self.errors_total, ('error', error_type, component))
+
+    def update_health_check(self, check: str, status: str, duration: Optional[float] = None):
+        """Record the latest result of a health check"""
+        for state in ("healthy", "degraded", "unhealthy", "unknown"):
+            self.health_check_status.labels(check=check, status=state).set(1 if state == status else 0)
+        if duration is not None:
+            self.health_check_duration_seconds.labels(check=check).set(duration)
 
     def record_db_connection(self, active_count: int):
         """Record database connection metrics"""
@@ -425,96 +588,116 @@ class MetricsService:
 
     # Decorators for automatic metrics collection
 
+    def _resolve_metric(self, metric_name: str, labels: Optional[Dict[str, str]] = None):
+        """Look up a metric by attribute name and bind its labels, or None if there is no such metric"""
+        metric = getattr(self, metric_name, None)
+        if metric is not None and labels:
+            return metric.labels(**labels)
+        return metric
+
     def track_time(self, metric_name: str, labels: Dict[str, str] = None):
         """Decorator to track function execution time"""
         def decorator(func):
-            @wraps(func)
-            async def async_wrapper(*args, **kwargs):
-                start_time = time.time()
-                try:
-                    result = await func(*args, **kwargs)
-                    return result
-                finally:
-                    duration = time.time() - start_time
-                    if hasattr(self, metric_name):
-                        metric = getattr(self, metric_name)
-                        if labels:
-                            metric.labels(**labels).observe(duration)
-                        else:
-                            metric.observe(duration)
-
-            @wraps(func)
-            def sync_wrapper(*args, **kwargs):
-                start_time = time.time()
-                try:
-                    result = func(*args, **kwargs)
-                    return result
-                finally:
-                    duration = time.time() - start_time
-                    if hasattr(self, metric_name):
-                        metric = getattr(self, metric_name)
-                        if labels:
-                            metric.labels(**labels).observe(duration)
-                        else:
-                            metric.observe(duration)
-
-            return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+            # Resolved once here; the per-call lookup is only kept for metrics that don't exist yet
+            # and for label mismatches, which must surface when called rather than at import
+            try:
+                bound = self._resolve_metric(metric_name, labels)
+            except ValueError:
+                bound = None
+            if bound is not None:
+                observe = bound.observe
+            else:
+                def observe(duration):
+                    metric = self._resolve_metric(metric_name, labels)
+                    if metric is not None:
+                        metric.observe(duration)
+
+            if asyncio.iscoroutinefunction(func):
+                @wraps(func)
+                async def wrapper(*args, **kwargs):
+                    start_time = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        observe(time.perf_counter() - start_time)
+            else:
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    start_time = time.perf_counter()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        observe(time.perf_counter() - start_time)
+
+            return wrapper
         return decorator
 
     def count_calls(self, metric_name: str, labels: Dict[str, str] = None):
         """Decorator to count function calls"""
+        error_labels = {**(labels or {}), 'status': 'error'}
+
         def decorator(func):
-            @wraps(func)
-            async def async_wrapper(*args, **kwargs):
+            # Resolved once here; the per-call lookup is only kept for metrics that don't exist yet
+            # and for label mismatches, which must surface when called rather than at import
+            try:
+                bound = self._resolve_metric(metric_name, labels)
+            except ValueError:
+                bound = None
+            if bound is not None:
+                count_success = bound.inc
                 try:
-                    result = await func(*args, **kwargs)
-                    if hasattr(self, metric_name):
-                        metric = getattr(self, metric_name)
-                        if labels:
-                            metric.labels(**labels).inc()
-                        else:
-                            metric.inc()
+                    count_error = self._resolve_metric(metric_name, error_labels).inc
+                except ValueError:
+                    # The metric has no 'status' label, so errors can't be told apart
+                    count_error = None
+            else:
+                def count_success():
+                    metric = self._resolve_metric(metric_name, labels)
+                    if metric is not None:
+                        metric.inc()
+
+                def count_error():
+                    metric = self._resolve_metric(metric_name, error_labels)
+                    if metric is not None:
+                        metric.inc()
+
+            if asyncio.iscoroutinefunction(func):
+                @wraps(func)
+                async def wrapper(*args, **kwargs):
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception:
+                        if count_error is not None:
+                            count_error()
+                        raise
+                    count_success()
                     return result
-                except Exception as e:
-                    if hasattr(self, metric_name):
-                        error_labels = labels.copy() if labels else {}
-                        error_labels['status'] = 'error'
-                        metric = getattr(self, metric_name)
-                        metric.labels(**error_labels).inc()
-                    raise
-
-            @wraps(func)
-            def sync_wrapper(*args, **kwargs):
-                try:
-                    result = func(*args, **kwargs)
-                    if hasattr(self, metric_name):
-                        metric = getattr(self, metric_name)
-                        if labels:
-                            metric.labels(**labels).inc()
-                        else:
-                            metric.inc()
+            else:
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception:
+                        if count_error is not None:
+                            count_error()
+                        raise
+                    count_success()
                     return result
-                except Exception as e:
-                    if hasattr(self, metric_name):
-                        error_labels = labels.copy() if labels else {}
-                        error_labels['status'] = 'error'
-                        metric = getattr(self, metric_name)
-                        metric.labels(**error_labels).inc()
-                    raise
-
-            return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+
+            return wrapper
         return decorator
 
     async def get_metrics_summary(self) -> Dict[str, Any]:
         """Get a summary of current metrics"""
         await self.update_system_metrics()
+        sample = self._psutil_cache
 
         # Get sample values (in a real implementation, you'd query the actual metrics)
         return {
             "system": {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
-                "disk_percent": psutil.disk_usage('/').percent
+                "cpu_percent": sample["cpu"],
+                "memory_percent": sample["mem"].percent if sample["mem"] else None,
+                "disk_percent": sample["disk"].percent if sample["disk"] else None
             },
             "application": {
                 "active_connections": 0,  # Would be actual value
@@ -528,11 +711,20 @@ class MetricsService:
             }
         }
 
-    def export_metrics(self) -> Response:
-        """Export metrics in Prometheus format"""
+    def export_metrics(self, accept_encoding: str = "") -> Response:
+        """Export metrics in Prometheus format, gzipped when the scraper accepts it"""
         try:
-            data = generate_latest(self.registry)
-            return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+            # Only render on the scrape path when the background renderer isn't keeping up
+            if not self._rendered or time.monotonic() - self._rendered_ts > self.RENDER_MAX_AGE:
+                self.flush()
+                self._render()
+            if "gzip" in accept_encoding:
+                return Response(
+                    content=self._rendered_gzip,
+                    media_type=CONTENT_TYPE_LATEST,
+                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+                )
+            return Response(content=self._rendered, media_type=CONTENT_TYPE_LATEST, headers={"Vary": "Accept-Encoding"})
         except Exception as e:
             logger.error("Failed to export metrics", error=str(e))
             return Response(content="", media_type=CONTENT_TYPE_LATEST)